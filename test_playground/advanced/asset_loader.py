@@ -0,0 +1,133 @@
+"""Shared loader for the CSV files in assets/.
+
+Each CSV is parsed once per process, and a binary columnar copy is kept in
+advanced/.columnar/ so later runs skip CSV parsing while the CSV is
+unchanged. Label columns can optionally be loaded as categoricals.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (needed by DataFrame.to_feather)
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+CACHE_DIR = Path(__file__).resolve().parent / ".columnar"  # kept out of assets/
+CATEGORY_COLUMNS = ("region", "product", "department")
+
+# (resolved path, categories) -> ((mtime_ns, size), DataFrame)
+_frames: dict[tuple[Path, bool], tuple[tuple[int, int], pd.DataFrame]] = {}
+_locks: dict[Path, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    # one lock per file, so two windows loading the same CSV parse it once
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def _cache_prefix(path: Path) -> str:
+    # same-named CSVs in different folders must not share copies
+    return f"{path.name}-{hashlib.blake2b(str(path).encode('utf-8'), digest_size=6).hexdigest()}"
+
+
+def _binary_path(path: Path, stamp: tuple[int, int]) -> Path:
+    # the CSV's mtime and size are part of the name, so a changed CSV never matches
+    suffix = "feather" if pyarrow is not None else "pkl"
+    return CACHE_DIR / f"{_cache_prefix(path)}.{stamp[0]}-{stamp[1]}.{suffix}"
+
+
+def _read_binary(binary: Path) -> pd.DataFrame:
+    return pd.read_feather(binary) if binary.suffix == ".feather" else pd.read_pickle(binary)
+
+
+def _write_binary(df: pd.DataFrame, path: Path, binary: Path) -> None:
+    binary.parent.mkdir(parents=True, exist_ok=True)
+    # unique temp name: two processes may write the same copy at once
+    with tempfile.NamedTemporaryFile(dir=binary.parent, prefix=binary.name + ".", suffix=".tmp", delete=False) as f:
+        tmp = Path(f.name)
+    try:
+        if binary.suffix == ".feather":
+            df.to_feather(tmp)
+        else:
+            df.to_pickle(tmp, compression=None)
+        os.replace(tmp, binary)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    for old in binary.parent.glob(f"{_cache_prefix(path)}.*"):
+        if old != binary and not old.name.endswith(".tmp"):
+            old.unlink(missing_ok=True)  # copies of older versions of this CSV
+
+
+def as_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df with the CATEGORY_COLUMNS label columns converted to categoricals."""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _load_plain(path: Path, stamp: tuple[int, int]) -> pd.DataFrame:
+    # same dtypes as pd.read_csv; the columnar copy only saves the parsing
+    binary = _binary_path(path, stamp)
+    if binary.exists():
+        try:
+            return _read_binary(binary)
+        except Exception:  # torn or unreadable copy: rebuild it from the CSV
+            binary.unlink(missing_ok=True)
+    df = pd.read_csv(path)
+    try:
+        _write_binary(df, path, binary)
+    except OSError:
+        pass  # read-only checkout: the in-process cache still helps
+    return df
+
+
+def load_asset(path: str | Path, copy: bool = True, categories: bool = False) -> pd.DataFrame:
+    """Return the DataFrame for a CSV (a name in assets/ or any path).
+
+    Order of preference: this process's cached frame, the columnar copy on
+    disk, parsing the CSV. Both caches are keyed by the CSV's mtime and
+    size. categories=True loads the label columns as categoricals (smaller,
+    but groupby results change dtype). Pass copy=False only if the caller
+    will not modify the frame.
+    """
+    path = Path(path)
+    if not path.is_absolute() and not path.exists():
+        path = ASSETS / path
+    path = path.resolve()
+    with _lock_for(path):
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _frames.get((path, categories))
+        if cached is None or cached[0] != stamp:
+            plain = _frames.get((path, False))
+            df = plain[1] if plain is not None and plain[0] == stamp else _load_plain(path, stamp)
+            _frames[(path, False)] = (stamp, df)
+            if categories:
+                df = as_categories(df)
+            cached = (stamp, df)
+            _frames[(path, categories)] = cached
+    return cached[1].copy() if copy else cached[1]
+
+
+def clear_cache(disk: bool = False) -> None:
+    """Forget parsed frames; with disk=True also delete their columnar copies."""
+    paths = {path for path, _ in _frames}
+    _frames.clear()
+    if disk:
+        for path in paths:
+            for binary in CACHE_DIR.glob(f"{_cache_prefix(path)}.*"):
+                binary.unlink(missing_ok=True)
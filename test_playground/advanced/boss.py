@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
 from pathlib import Path
+import queue
+import threading
+from typing import Any, Callable
 
 import numpy as np
 import pandas as pd
@@ -22,10 +28,30 @@ from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from asset_loader import load_asset
+from large_clustering import (
+    LARGE_DATA_ROWS,
+    SCAN_SAMPLE,
+    count_rows,
+    csv_chunks,
+    fit_large,
+    minibatch_model,
+    numeric_columns,
+    sample_csv,
+    sampled_silhouette,
+)
+from model_cache import MODEL_CACHE
+from virtual_table import ColumnStore, VirtualTable
+
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 REG_PATH = ASSETS / "ml_regression.csv"
 CLS_PATH = ASSETS / "ml_classification.csv"
 SALES_PATH = ASSETS / "sales.csv"
+PLOT_POINTS = 20_000  # rows a large dataset shows in the table and scatter plot
+
+POLL_MS = 50  # how often a window checks its background job
+# sklearn/numpy release the GIL in their heavy loops, so threads train windows in parallel
+TRAINING_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="ml-train")
 
 
 # helper with a tiny logic bug
@@ -40,7 +66,251 @@ def regression_rmse(y_true, y_pred) -> float:
     return float(mean_absolute_error(y_true, y_pred))  # hint: RMSE should use sqrt(mean_squared_error)
 
 
-class MLWindow(tk.Toplevel):
+def summary_lines(df: pd.DataFrame, title: str) -> list[str]:
+    """Text for a window's summary panel (safe to build off the Tk thread)."""
+    r, c = quick_shape(df)
+    numeric = df.select_dtypes(include=[np.number]).columns.tolist()
+    lines = [
+        title,
+        f"Rows: {r}",
+        f"Columns: {c}",
+        f"Column names: {', '.join(df.columns)}",
+        "",
+        "Basic stats (first 4 numeric columns):",
+    ]
+    for col in numeric[:4]:
+        lines.append(f"- {col}: mean={df[col].mean():.3f}, std={df[col].std():.3f}")
+    return lines
+
+
+class DatasetError(ValueError):
+    """Raised by a training job when its dataset cannot be used."""
+
+
+class TrainingCancelled(Exception):
+    """Raised inside a training job once its window asked it to stop."""
+
+
+class TrainingJob:
+    """One background load/fit/score run.
+
+    The worker calls report() between stages; that both queues progress for
+    the window and is where a cancel request takes effect (a running fit
+    cannot be interrupted, its result is simply dropped).
+    """
+
+    def __init__(self, fn: Callable[..., dict[str, Any]], *args: Any):
+        self.progress: queue.Queue[tuple[float, str]] = queue.Queue()
+        self._cancel = threading.Event()
+        self.future: Future = TRAINING_POOL.submit(fn, self, *args)
+
+    def report(self, fraction: float, message: str) -> None:
+        if self._cancel.is_set():
+            raise TrainingCancelled
+        self.progress.put((fraction, message))
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self.future.cancel()  # only helps if it has not started yet
+
+
+def table_store(job: TrainingJob, df: pd.DataFrame) -> ColumnStore:
+    """Column store for the window's table, with sort indexes built off the Tk thread."""
+    job.report(0.02, "Indexing table")
+    store = ColumnStore(df)
+    store.precompute()
+    return store
+
+
+def fit_cached(job: TrainingJob, model: Any, path: Path, X, y, label: str, random_state: int, **split: Any) -> Any:
+    """Return model fitted on (X, y), reusing a cached fit of the same data and config."""
+    key = MODEL_CACHE.key(path, model, random_state=random_state, **split)
+    cached = MODEL_CACHE.load(key)
+    if cached is not None:
+        job.report(0.6, f"Loaded cached {label}")
+        return cached
+    job.report(0.3, f"Fitting {label}")
+    model.fit(X, y)
+    MODEL_CACHE.save(key, model)
+    return model
+
+
+def train_regression(job: TrainingJob, path: Path) -> dict[str, Any]:
+    """Load the regression CSV, fit scaler + LinearRegression and score it."""
+    job.report(0.05, "Loading data")
+    df = load_asset(path, copy=False)  # read-only here
+    summary = summary_lines(df, "Regression dataset")
+    table = table_store(job, df)
+
+    X = df.drop(columns=["y"])
+    y = df["y"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
+
+    pipe = Pipeline(
+        steps=[
+            ("scaler", StandardScaler()),
+            ("model", LinearRegression()),
+        ]
+    )
+    pipe = fit_cached(job, pipe, path, X_train, y_train, "LinearRegression", random_state=42, test_size=0.25)
+    job.report(0.8, "Scoring")
+    pred = pipe.predict(X_test)
+
+    rmse = regression_rmse(y_test, pred)
+    mse = float(mean_squared_error(y_test, pred))
+    return {"table": table, "summary": summary, "y_test": y_test, "pred": pred, "rmse": rmse, "mse": mse}
+
+
+def train_classification(job: TrainingJob, path: Path) -> dict[str, Any]:
+    """Load the classification CSV, fit the preprocessing + LogisticRegression pipeline."""
+    job.report(0.05, "Loading data")
+    df = load_asset(path, copy=False)  # read-only here
+    summary = summary_lines(df, "Classification dataset")
+    table = table_store(job, df)
+
+    X = df.drop(columns=["label"])
+    y = df["label"]
+
+    numeric_cols = X.select_dtypes(include=["number"]).columns.tolist()
+    categorical_cols = X.select_dtypes(exclude=["number"]).columns.tolist()
+
+    pre = ColumnTransformer(
+        transformers=[
+            (
+                "num",
+                Pipeline([
+                    ("imputer", SimpleImputer(strategy="median")),
+                    ("scaler", StandardScaler()),
+                ]),
+                numeric_cols,
+            ),
+            (
+                "cat",
+                Pipeline([
+                    ("imputer", SimpleImputer(strategy="most_frequent")),
+                    ("onehot", OneHotEncoder(handle_unknown="ignore")),
+                ]),
+                categorical_cols,
+            ),
+        ]
+    )
+
+    model = Pipeline(
+        steps=[
+            ("pre", pre),
+            ("clf", LogisticRegression(max_iter=1000)),
+        ]
+    )
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=0.3,
+        random_state=42,
+        stratify=y,
+    )
+    model = fit_cached(
+        job, model, path, X_train, y_train, "LogisticRegression", random_state=42, test_size=0.3, stratify=True
+    )
+    job.report(0.8, "Scoring")
+    pred = model.predict(X_test)
+
+    acc = float(np.mean(pred == 1))  # hint: accuracy should compare pred with y_test
+    sk_acc = float(accuracy_score(y_test, pred))
+    return {"table": table, "summary": summary, "X_test": X_test, "pred": pred, "acc": acc, "sk_acc": sk_acc}
+
+
+def train_clustering(job: TrainingJob, path: Path) -> dict[str, Any]:
+    """Load the sales CSV and cluster its first two numeric columns.
+
+    From LARGE_DATA_ROWS rows on, exact KMeans + silhouette would not finish,
+    so train_clustering_large streams the file instead of loading it.
+    """
+    rows = count_rows(path)
+    if rows >= LARGE_DATA_ROWS:
+        return train_clustering_large(job, path, rows)
+
+    job.report(0.05, "Loading data")
+    df = load_asset(path, copy=False)  # read-only here
+    summary = summary_lines(df, "Sales clustering dataset")
+    table = table_store(job, df)
+
+    numeric = df.select_dtypes(include=[np.number])
+    if numeric.shape[1] < 2:
+        raise DatasetError("Sales dataset needs >=2 numeric columns for clustering")
+
+    X = numeric.iloc[:, :2].to_numpy()
+    scaler = StandardScaler()
+    Xs = scaler.fit_transform(X)
+    columns = list(numeric.columns[:2])
+
+    km = KMeans(n_clusters=3, random_state=42, n_init=10)
+    km = fit_cached(job, km, path, Xs, None, "KMeans", random_state=42, features=2)
+    labels = km.labels_  # same Xs the model was fitted on
+
+    job.report(0.7, "Scoring silhouette")
+    sil = float(-silhouette_score(Xs, labels))  # hint: silhouette score should not be negated
+    return {
+        "table": table,
+        "summary": summary,
+        "Xs": Xs,
+        "labels": labels,
+        "centers": km.cluster_centers_,
+        "columns": columns,
+        "sil": sil,
+    }
+
+
+def train_clustering_large(job: TrainingJob, path: Path, rows: int) -> dict[str, Any]:
+    """Mini-batch clustering that reads the CSV in chunks; table and plot use a row sample.
+
+    The k-scan and the fitted model are cached in MODEL_CACHE, so reopening
+    the window on an unchanged file only repeats the sampling pass.
+    """
+    columns = numeric_columns(path)[:2]
+    if len(columns) < 2:
+        raise DatasetError("Sales dataset needs >=2 numeric columns for clustering")
+
+    job.report(0.05, "Sampling rows")
+    sample, scaler = sample_csv(path, columns, SCAN_SAMPLE, random_state=42)
+    shown = sample.sample(n=min(PLOT_POINTS, len(sample)), random_state=42).sort_index()
+    summary = summary_lines(shown, "Sales clustering dataset")
+    summary.insert(1, f"Sampled {len(shown):,} of {rows:,} rows for the table and plot")
+    table = table_store(job, shown)
+
+    key = MODEL_CACHE.key(path, minibatch_model(3, random_state=42), random_state=42, mode="large", columns=columns)
+    fitted = MODEL_CACHE.load(key)
+    if fitted is not None:
+        job.report(0.8, "Loaded cached MiniBatchKMeans")
+    else:
+        fitted = fit_large(
+            lambda: (scaler.transform(chunk) for chunk in csv_chunks(path, columns)),
+            scaler.transform(sample[columns].to_numpy(dtype=float)),
+            k=3,
+            random_state=42,
+            progress=job.report,
+        )
+        MODEL_CACHE.save(key, fitted)
+
+    job.report(0.85, "Estimating silhouette")
+    Xs = scaler.transform(shown[columns].to_numpy(dtype=float))
+    labels = fitted["model"].predict(Xs)
+    sil, low, high = sampled_silhouette(Xs, labels, random_state=42)
+    return {
+        "table": table,
+        "summary": summary,
+        "Xs": Xs,
+        "labels": labels,
+        "centers": fitted["model"].cluster_centers_,
+        "columns": columns,
+        "sil": sil,
+        "sil_ci": (low, high),
+        "suggested_k": fitted["suggested_k"],
+        "rows": rows,
+    }
+
+
+class MLWindow(tk.Toplevel, ABC):
     """Base Toplevel window with left info panel and right plot panel."""
 
     def __init__(self, master: tk.Tk, title: str):
@@ -49,11 +319,17 @@ class MLWindow(tk.Toplevel):
         self.geometry("1080x620")
 
         self.left_text: tk.Text | None = None
+        self.table: VirtualTable | None = None
         self.tree: ttk.Treeview | None = None
         self.metric_label: ttk.Label | None = None
         self.figure: Figure | None = None
         self.ax = None
         self.canvas: FigureCanvasTkAgg | None = None
+        self.progress: ttk.Progressbar | None = None
+        self.status_label: ttk.Label | None = None
+        self.cancel_button: ttk.Button | None = None
+        self.job: TrainingJob | None = None
+        self._poll_id: str | None = None  # pending after() for _poll_job
 
         self._build_layout()
 
@@ -72,11 +348,9 @@ class MLWindow(tk.Toplevel):
         self.left_text = tk.Text(left, height=10, width=50)
         self.left_text.grid(row=0, column=0, sticky="ew", pady=(0, 8))
 
-        self.tree = ttk.Treeview(left, show="headings", height=18)
-        self.tree.grid(row=1, column=0, sticky="nsew")
-        scrollbar = ttk.Scrollbar(left, orient="vertical", command=self.tree.yview)
-        scrollbar.grid(row=1, column=1, sticky="ns")
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.table = VirtualTable(left, height=18)
+        self.table.grid(row=1, column=0, sticky="nsew")
+        self.tree = self.table.tree
 
         right = ttk.Frame(container)
         right.grid(row=0, column=1, sticky="nsew")
@@ -89,34 +363,27 @@ class MLWindow(tk.Toplevel):
         self.metric_label = ttk.Label(right, text="Metrics: N/A", font=("TkDefaultFont", 10, "bold"))
         self.metric_label.pack(anchor="w", pady=(6, 0))
 
-    def fill_table(self, df: pd.DataFrame, n: int = 20) -> None:
-        if self.tree is None:
+        status = ttk.Frame(right)
+        status.pack(fill="x", pady=(6, 0))
+        self.progress = ttk.Progressbar(status, mode="determinate", maximum=1.0, length=220)
+        self.progress.pack(side="left")
+        self.status_label = ttk.Label(status, text="Idle")
+        self.status_label.pack(side="left", padx=8)
+        self.cancel_button = ttk.Button(status, text="Cancel", command=self.cancel_job, state="disabled")
+        self.cancel_button.pack(side="right")
+
+    def fill_table(self, df: pd.DataFrame, n: int | None = None) -> None:
+        # all rows by default: the virtual table only materializes the visible ones
+        if self.table is None:
             return
-        self.tree.delete(*self.tree.get_children())
-        cols = list(df.columns)
-        self.tree["columns"] = cols
-        for col in cols:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=110, anchor="center")
-        for _, row in df.head(n).iterrows():
-            self.tree.insert("", "end", values=[row[c] for c in cols])
+        self.table.set_data(df if n is None else df.head(n))
 
     def fill_summary(self, df: pd.DataFrame, title: str) -> None:
+        self.show_summary(summary_lines(df, title))
+
+    def show_summary(self, lines: list[str]) -> None:
         if self.left_text is None:
             return
-        r, c = quick_shape(df)
-        numeric = df.select_dtypes(include=[np.number]).columns.tolist()
-        lines = [
-            title,
-            f"Rows: {r}",
-            f"Columns: {c}",
-            f"Column names: {', '.join(df.columns)}",
-            "",
-            "Basic stats (first 4 numeric columns):",
-        ]
-        for col in numeric[:4]:
-            lines.append(f"- {col}: mean={df[col].mean():.3f}, std={df[col].std():.3f}")
-
         self.left_text.delete("1.0", tk.END)
         self.left_text.insert("1.0", "\n".join(lines))
 
@@ -124,6 +391,78 @@ class MLWindow(tk.Toplevel):
         if self.metric_label is not None:
             self.metric_label.config(text=text)
 
+    def set_status(self, fraction: float, text: str) -> None:
+        if self.progress is not None:
+            self.progress["value"] = fraction
+        if self.status_label is not None:
+            self.status_label.config(text=text)
+
+    def start_job(self, fn: Callable[..., dict[str, Any]], *args: Any) -> None:
+        """Run fn(job, *args) on the training pool and show its result when done."""
+        self.cancel_job()
+        self.job = TrainingJob(fn, *args)
+        self.set_status(0.0, "Queued")
+        if self.cancel_button is not None:
+            self.cancel_button.config(state="normal")
+        self._poll_id = self.after(POLL_MS, self._poll_job, self.job)
+
+    def cancel_job(self) -> None:
+        # also drop the pending poll: destroy() removes its Tcl command, so it
+        # would fail with "invalid command name" instead of reaching _poll_job
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self.job is not None and not self.job.future.done():
+            self.job.cancel()
+            self.set_status(0.0, "Cancelled")
+        self.job = None
+        if self.cancel_button is not None:
+            self.cancel_button.config(state="disabled")
+
+    def _poll_job(self, job: TrainingJob) -> None:
+        # runs on the Tk thread: drain progress, then either reschedule or finish
+        self._poll_id = None
+        if job is not self.job or not self.winfo_exists():
+            return  # superseded or cancelled
+        try:
+            while True:
+                self.set_status(*job.progress.get_nowait())
+        except queue.Empty:
+            pass
+        if not job.future.done():
+            self._poll_id = self.after(POLL_MS, self._poll_job, job)
+            return
+
+        self.job = None
+        if self.cancel_button is not None:
+            self.cancel_button.config(state="disabled")
+        try:
+            result = job.future.result()
+        except TrainingCancelled:
+            self.set_status(0.0, "Cancelled")
+            return
+        except DatasetError as exc:
+            messagebox.showerror("Dataset error", str(exc), parent=self)
+            self.destroy()
+            return
+        except Exception as exc:  # surface worker errors instead of losing them
+            self.set_status(0.0, "Failed")
+            messagebox.showerror("Training failed", f"{type(exc).__name__}: {exc}", parent=self)
+            return
+        self.show_summary(result["summary"])
+        if self.table is not None:
+            self.table.set_store(result["table"])
+        self.show(result)
+        self.set_status(1.0, "Done")
+
+    @abstractmethod
+    def show(self, result: dict[str, Any]) -> None:
+        """Draw a finished job's result (Tk thread)."""
+
+    def destroy(self) -> None:
+        self.cancel_job()
+        super().destroy()
+
 
 class RegressionWindow(MLWindow):
     """Regression demonstration window."""
@@ -137,27 +476,10 @@ class RegressionWindow(MLWindow):
             messagebox.showerror("Missing dataset", f"Missing: {REG_PATH}")
             self.destroy()
             return
+        self.start_job(train_regression, REG_PATH)
 
-        df = pd.read_csv(REG_PATH)
-        self.fill_summary(df, "Regression dataset")
-        self.fill_table(df)
-
-        X = df.drop(columns=["y"])
-        y = df["y"]
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
-
-        pipe = Pipeline(
-            steps=[
-                ("scaler", StandardScaler()),
-                ("model", LinearRegression()),
-            ]
-        )
-        pipe.fit(X_train, y_train)
-        pred = pipe.predict(X_test)
-
-        rmse = regression_rmse(y_test, pred)
-        mse = float(mean_squared_error(y_test, pred))
-
+    def show(self, result: dict[str, Any]) -> None:
+        y_test, pred = result["y_test"], result["pred"]
         self.ax.clear()
         self.ax.scatter(y_test, pred, alpha=0.7, color="tab:blue", label="pred")
         lims = [min(y_test.min(), pred.min()), max(y_test.max(), pred.max())]
@@ -169,7 +491,7 @@ class RegressionWindow(MLWindow):
         self.figure.tight_layout()
         self.canvas.draw()
 
-        self.set_metrics(f"Metrics: RMSE={rmse:.4f}, MSE={mse:.4f}")
+        self.set_metrics(f"Metrics: RMSE={result['rmse']:.4f}, MSE={result['mse']:.4f}")
 
 
 class ClassificationWindow(MLWindow):
@@ -184,58 +506,10 @@ class ClassificationWindow(MLWindow):
             messagebox.showerror("Missing dataset", f"Missing: {CLS_PATH}")
             self.destroy()
             return
+        self.start_job(train_classification, CLS_PATH)
 
-        df = pd.read_csv(CLS_PATH)
-        self.fill_summary(df, "Classification dataset")
-        self.fill_table(df)
-
-        X = df.drop(columns=["label"])
-        y = df["label"]
-
-        numeric_cols = X.select_dtypes(include=["number"]).columns.tolist()
-        categorical_cols = X.select_dtypes(exclude=["number"]).columns.tolist()
-
-        pre = ColumnTransformer(
-            transformers=[
-                (
-                    "num",
-                    Pipeline([
-                        ("imputer", SimpleImputer(strategy="median")),
-                        ("scaler", StandardScaler()),
-                    ]),
-                    numeric_cols,
-                ),
-                (
-                    "cat",
-                    Pipeline([
-                        ("imputer", SimpleImputer(strategy="most_frequent")),
-                        ("onehot", OneHotEncoder(handle_unknown="ignore")),
-                    ]),
-                    categorical_cols,
-                ),
-            ]
-        )
-
-        model = Pipeline(
-            steps=[
-                ("pre", pre),
-                ("clf", LogisticRegression(max_iter=1000)),
-            ]
-        )
-
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,
-            y,
-            test_size=0.3,
-            random_state=42,
-            stratify=y,
-        )
-        model.fit(X_train, y_train)
-        pred = model.predict(X_test)
-
-        acc = float(np.mean(pred == 1))  # hint: accuracy should compare pred with y_test
-        sk_acc = float(accuracy_score(y_test, pred))
-
+    def show(self, result: dict[str, Any]) -> None:
+        X_test, pred = result["X_test"], result["pred"]
         self.ax.clear()
         cls0 = X_test[pred == 0]
         cls1 = X_test[pred == 1]
@@ -248,7 +522,7 @@ class ClassificationWindow(MLWindow):
         self.figure.tight_layout()
         self.canvas.draw()
 
-        self.set_metrics(f"Metrics: accuracy={acc:.4f}, sklearn_acc={sk_acc:.4f}")
+        self.set_metrics(f"Metrics: accuracy={result['acc']:.4f}, sklearn_acc={result['sk_acc']:.4f}")
 
 
 class ClusteringWindow(MLWindow):
@@ -263,38 +537,31 @@ class ClusteringWindow(MLWindow):
             messagebox.showerror("Missing dataset", f"Missing: {SALES_PATH}")
             self.destroy()
             return
+        self.start_job(train_clustering, SALES_PATH)
 
-        df = pd.read_csv(SALES_PATH)
-        self.fill_summary(df, "Sales clustering dataset")
-        self.fill_table(df)
-
-        numeric = df.select_dtypes(include=[np.number])
-        if numeric.shape[1] < 2:
-            messagebox.showerror("Dataset error", "Sales dataset needs >=2 numeric columns for clustering")
-            self.destroy()
-            return
-
-        X = numeric.iloc[:, :2].to_numpy()
-        scaler = StandardScaler()
-        Xs = scaler.fit_transform(X)
-
-        km = KMeans(n_clusters=3, random_state=42, n_init=10)
-        labels = km.fit_predict(Xs)
-
-        sil = float(-silhouette_score(Xs, labels))  # hint: silhouette score should not be negated
-
+    def show(self, result: dict[str, Any]) -> None:
+        Xs, labels, centers = result["Xs"], result["labels"], result["centers"]
         self.ax.clear()
         self.ax.scatter(Xs[:, 0], Xs[:, 1], c=labels, cmap="viridis", alpha=0.75)
-        centers = km.cluster_centers_
         self.ax.scatter(centers[:, 0], centers[:, 1], color="red", marker="X", s=140, label="centers")
-        self.ax.set_title("KMeans Clusters (scaled 2D features)")
-        self.ax.set_xlabel(numeric.columns[0])
-        self.ax.set_ylabel(numeric.columns[1])
+        if "sil_ci" in result:
+            self.ax.set_title(f"MiniBatchKMeans Clusters ({len(Xs):,} of {result['rows']:,} points shown)")
+        else:
+            self.ax.set_title("KMeans Clusters (scaled 2D features)")
+        self.ax.set_xlabel(result["columns"][0])
+        self.ax.set_ylabel(result["columns"][1])
         self.ax.legend()
         self.figure.tight_layout()
         self.canvas.draw()
 
-        self.set_metrics(f"Metrics: silhouette={sil:.4f}")
+        if "sil_ci" in result:
+            low, high = result["sil_ci"]
+            self.set_metrics(
+                f"Metrics: silhouette~{result['sil']:.4f} (95% CI {low:.4f}..{high:.4f}, sampled), "
+                f"k-scan suggests k={result['suggested_k']}"
+            )
+        else:
+            self.set_metrics(f"Metrics: silhouette={result['sil']:.4f}")
 
 
 class AdvancedMLApp(tk.Tk):
@@ -331,6 +598,7 @@ def run_app() -> None:
     """Run the advanced Tkinter boss app."""
     app = AdvancedMLApp()
     app.mainloop()
+    TRAINING_POOL.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+from asset_loader import load_asset
+
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 DEFAULT_PATH = ASSETS / "ml_classification.csv"
 
@@ -18,7 +20,7 @@ def load_or_create_dataset(path: str = str(DEFAULT_PATH), n_rows: int = 250) ->
     """Load dataset with mixed numeric/categorical features."""
     file = Path(path)
     if file.exists():
-        base = pd.read_csv(file)
+        base = load_asset(file)
         rng = np.random.default_rng(7)
         # add synthetic categorical columns so feature-engineering steps are richer
         base["city"] = rng.choice(["Delhi", "Pune", "Chennai", "Kolkata"], size=len(base))
@@ -0,0 +1,199 @@
+"""Clustering for datasets too large for KMeans(n_init=10) + exact silhouette.
+
+Nothing here loads the whole CSV: rows are counted and sampled in one
+streaming pass, MiniBatchKMeans is trained chunk by chunk straight from the
+file, silhouette is estimated on repeated random samples with a confidence
+interval, and candidate k values are fitted in parallel on the sample.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+LARGE_DATA_ROWS = 200_000  # at or above this many rows the window switches to this module
+CHUNK_ROWS = 50_000
+BATCH_SIZE = 4096
+SCAN_SAMPLE = 100_000  # rows used to compare candidate k values
+SILHOUETTE_SAMPLE = 2_000  # silhouette is O(n^2), so each estimate uses this many points
+SILHOUETTE_REPEATS = 10
+K_CANDIDATES = range(2, 9)
+PROBE_ROWS = 1_000  # rows read to infer column types
+
+Progress = Callable[[float, str], None]
+
+
+def _no_progress(fraction: float, message: str) -> None:
+    pass
+
+
+def count_rows(path: Path) -> int:
+    """Data rows in a CSV (header excluded), counted from newlines without parsing."""
+    lines = 0
+    last = b"\n"
+    with Path(path).open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1  # final line has no newline
+    return max(lines - 1, 0)
+
+
+def numeric_columns(path: Path, probe_rows: int = PROBE_ROWS) -> list[str]:
+    """Numeric column names, inferred from the first probe_rows rows."""
+    head = pd.read_csv(path, nrows=probe_rows)
+    return head.select_dtypes(include=[np.number]).columns.tolist()
+
+
+def csv_chunks(path: Path, columns: list[str], size: int = CHUNK_ROWS) -> Iterator[np.ndarray]:
+    """Yield float blocks of the given CSV columns without loading the whole file."""
+    for frame in pd.read_csv(path, usecols=columns, chunksize=size):
+        yield frame[columns].to_numpy(dtype=float)
+
+
+def sample_csv(
+    path: Path,
+    columns: list[str],
+    n: int,
+    random_state: int = 42,
+    size: int = CHUNK_ROWS,
+) -> tuple[pd.DataFrame, StandardScaler]:
+    """One streaming pass: a uniform sample of n whole rows, and a scaler fitted on every row.
+
+    Each row gets a random key and the n smallest keys are kept, so at most
+    n + size rows are in memory. The sample keeps file order; the scaler is
+    fitted on `columns` of the full file with partial_fit.
+    """
+    rng = np.random.default_rng(random_state)
+    scaler = StandardScaler()
+    kept: pd.DataFrame | None = None
+    for frame in pd.read_csv(path, chunksize=size):
+        scaler.partial_fit(frame[columns].to_numpy(dtype=float))
+        frame = frame.assign(_key=rng.random(len(frame)))
+        kept = frame if kept is None else pd.concat([kept, frame])
+        if len(kept) > n:
+            kept = kept.nsmallest(n, "_key")
+    if kept is None:
+        raise ValueError(f"{path} has no data rows")
+    return kept.sort_index().drop(columns="_key"), scaler
+
+
+def minibatch_model(k: int, random_state: int = 42, batch_size: int = BATCH_SIZE) -> MiniBatchKMeans:
+    """The unfitted MiniBatchKMeans every fit here uses (and model cache keys describe)."""
+    return MiniBatchKMeans(n_clusters=k, random_state=random_state, batch_size=batch_size, n_init=3)
+
+
+def fit_minibatch(
+    chunks: Callable[[], Iterable[np.ndarray]],
+    k: int,
+    random_state: int = 42,
+    passes: int = 2,
+    batch_size: int = BATCH_SIZE,
+    progress: Progress = _no_progress,
+) -> MiniBatchKMeans:
+    """Train MiniBatchKMeans with partial_fit over every chunk, `passes` times.
+
+    chunks() must return a fresh iterable each call (one per pass). Rows are
+    shuffled within a chunk so sorted files do not bias the batches.
+    """
+    model = minibatch_model(k, random_state, batch_size)
+    rng = np.random.default_rng(random_state)
+    for p in range(passes):
+        for chunk in chunks():
+            progress(p / passes, f"MiniBatchKMeans pass {p + 1}/{passes}")
+            chunk = chunk[rng.permutation(len(chunk))]
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk[start:start + batch_size]
+                if len(batch) >= k:  # the first call needs at least k points to seed centers
+                    model.partial_fit(batch)
+    return model
+
+
+def sampled_silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    sample_size: int = SILHOUETTE_SAMPLE,
+    repeats: int = SILHOUETTE_REPEATS,
+    random_state: int = 42,
+    confidence: float = 0.95,
+) -> tuple[float, float, float]:
+    """Estimate silhouette from `repeats` random samples; return (mean, low, high).
+
+    The interval is a Student-t interval over the per-sample scores.
+    """
+    rng = np.random.default_rng(random_state)
+    size = min(sample_size, len(X))
+    scores = []
+    for _ in range(repeats):
+        idx = rng.choice(len(X), size=size, replace=False)
+        if len(np.unique(labels[idx])) < 2:
+            continue  # silhouette needs two clusters in the sample
+        scores.append(silhouette_score(X[idx], labels[idx]))
+    if not scores:
+        return float("nan"), float("nan"), float("nan")
+    mean = float(np.mean(scores))
+    if len(scores) < 2:
+        return mean, mean, mean
+    half = float(stats.t.ppf((1 + confidence) / 2, len(scores) - 1) * np.std(scores, ddof=1) / np.sqrt(len(scores)))
+    return mean, mean - half, mean + half
+
+
+def scan_k(
+    X: np.ndarray,
+    ks: Iterable[int] = K_CANDIDATES,
+    random_state: int = 42,
+    sample_rows: int = SCAN_SAMPLE,
+    workers: int | None = None,
+) -> list[dict[str, float]]:
+    """Fit MiniBatchKMeans for each candidate k in parallel; return inertia and silhouette per k."""
+    ks = list(ks)
+    rng = np.random.default_rng(random_state)
+    sample = X[rng.choice(len(X), size=min(sample_rows, len(X)), replace=False)]
+
+    def one(k: int) -> dict[str, float]:
+        model = minibatch_model(k, random_state)
+        labels = model.fit_predict(sample)
+        sil, low, high = sampled_silhouette(sample, labels, repeats=5, random_state=random_state)
+        # inertia per sampled row, so it is comparable across sample sizes
+        return {"k": k, "inertia": model.inertia_ / len(sample), "silhouette": sil, "low": low, "high": high}
+
+    with ThreadPoolExecutor(max_workers=workers or min(len(ks), os.cpu_count() or 1)) as pool:
+        return list(pool.map(one, ks))
+
+
+def fit_large(
+    chunks: Callable[[], Iterable[np.ndarray]],
+    sample: np.ndarray,
+    k: int | None = None,
+    random_state: int = 42,
+    progress: Progress = _no_progress,
+) -> dict[str, object]:
+    """Scalable replacement for KMeans on scaled features.
+
+    The k-scan runs on the in-memory `sample`; its best candidate (by sampled
+    silhouette) is returned as suggested_k and used when k is None. The model
+    itself is trained over chunks() (see fit_minibatch).
+    """
+    progress(0.1, "Scanning k values")
+    scan = scan_k(sample, random_state=random_state)
+    suggested = int(max(scan, key=lambda row: np.nan_to_num(row["silhouette"], nan=-1.0))["k"])
+    if k is None:
+        k = suggested
+
+    model = fit_minibatch(
+        chunks,
+        k,
+        random_state=random_state,
+        progress=lambda f, msg: progress(0.3 + 0.5 * f, msg),
+    )
+    return {"k": k, "suggested_k": suggested, "model": model, "scan": scan}
@@ -0,0 +1,76 @@
+"""Cold-start and repeat-load timings for asset_loader.load_asset.
+
+Usage: python loader_benchmarks.py [rows]
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import asset_loader
+
+
+# sales.csv-shaped file with `rows` rows
+def make_sales_csv(path: Path, rows: int, seed: int = 3) -> None:
+    rng = np.random.default_rng(seed)
+    units = rng.integers(1, 80, rows)
+    price = rng.choice([20, 45, 120, 300, 950], rows)
+    discount = rng.choice([0.0, 0.05, 0.1], rows)
+    pd.DataFrame(
+        {
+            "date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+            "region": rng.choice(["North", "South", "East", "West"], rows),
+            "product": rng.choice(["Notebook", "Pen", "Bottle", "Bag", "Backpack"], rows),
+            "units": units,
+            "unit_price": price,
+            "discount": discount,
+            "revenue": (units * price * (1 - discount)).round(2),
+        }
+    ).to_csv(path, index=False)
+
+
+def _ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_loader(rows: int = 1_000_000) -> dict[str, float]:
+    """Time plain read_csv against the loader's cold, disk-warm and memory-warm paths (ms)."""
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "sales_big.csv"
+        make_sales_csv(csv_path, rows)
+        results["pd.read_csv"] = _ms(lambda: pd.read_csv(csv_path))
+
+        asset_loader.clear_cache(disk=True)
+        results["cold (parse + write columnar copy)"] = _ms(lambda: asset_loader.load_asset(csv_path))
+        results["repeat, same process (copy=False)"] = _ms(lambda: asset_loader.load_asset(csv_path, copy=False))
+        results["repeat, same process (copy)"] = _ms(lambda: asset_loader.load_asset(csv_path))
+
+        asset_loader.clear_cache()  # what a fresh process sees
+        results["new process (columnar copy)"] = _ms(lambda: asset_loader.load_asset(csv_path))
+
+        st = csv_path.stat()
+        os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        results["after CSV mtime change (reparse)"] = _ms(lambda: asset_loader.load_asset(csv_path))
+
+        raw = pd.read_csv(csv_path).memory_usage(deep=True).sum()
+        hinted = asset_loader.load_asset(csv_path, copy=False, categories=True).memory_usage(deep=True).sum()
+        results["memory MB, plain read_csv"] = raw / 1e6
+        results["memory MB, with categoricals"] = hinted / 1e6
+        asset_loader.clear_cache(disk=True)
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for label, value in bench_loader(n).items():
+        print(f"{label:>38}: {value:10.1f}")
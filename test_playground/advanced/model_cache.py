@@ -0,0 +1,146 @@
+"""Persistent cache of fitted sklearn models, keyed by dataset content and model config."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any
+
+try:
+    import joblib
+    import sklearn
+except ImportError:  # pragma: no cover
+    joblib = None
+    sklearn = None
+
+CACHE_DIR = Path(__file__).resolve().parent / ".model_cache"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# path -> (mtime_ns, size, digest): a file is only re-hashed after it changes on disk
+_digests: dict[str, tuple[int, int, str]] = {}
+_digests_lock = threading.Lock()
+
+
+def dataset_digest(path: Path) -> str:
+    """Content hash of a dataset file, recomputed only when its mtime or size changes."""
+    path = Path(path).resolve()
+    st = path.stat()
+    with _digests_lock:
+        known = _digests.get(str(path))
+    if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+        return known[2]
+    h = hashlib.blake2b(digest_size=20)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _digests_lock:
+        _digests[str(path)] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+# nested estimators become their class name; their own params are listed separately
+def _plain(value: Any) -> Any:
+    if hasattr(value, "get_params"):
+        return type(value).__name__
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def model_config(estimator: Any) -> str:
+    """Stable text form of an estimator's full (deep) parameter set."""
+    params = estimator.get_params(deep=True)
+    return repr(sorted((k, _plain(v)) for k, v in params.items()))
+
+
+class ModelCache:
+    """Fitted models stored with joblib, evicted least-recently-used once over max_bytes."""
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return joblib is not None
+
+    def key(self, dataset: Path, estimator: Any, random_state: int | None = None, **extra: Any) -> str:
+        """Cache key for fitting estimator on dataset; extra holds split settings etc."""
+        payload = {
+            "data": dataset_digest(dataset),
+            "model": model_config(estimator),
+            "random_state": random_state,
+            "extra": extra,
+            "sklearn": getattr(sklearn, "__version__", None),  # pickles do not cross versions
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+    def _file(self, key: str) -> Path:
+        return self.directory / f"{key}.joblib"
+
+    def load(self, key: str) -> Any | None:
+        """Return the cached model for key, or None on a miss."""
+        path = self._file(key)
+        if not self.enabled or not path.exists():
+            self.misses += 1
+            return None
+        try:
+            model = joblib.load(path)
+        except Exception:  # truncated or from an incompatible version: refit instead
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        os.utime(path)  # mtime doubles as the LRU clock
+        self.hits += 1
+        return model
+
+    def save(self, key: str, model: Any) -> None:
+        """Store a fitted model atomically, then trim the cache to max_bytes."""
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(model, tmp)
+            os.replace(tmp, self._file(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used models until the cache fits; return how many went."""
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.joblib"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
+
+    def clear(self) -> None:
+        """Remove every cached model."""
+        for path in self.directory.glob("*.joblib"):
+            path.unlink(missing_ok=True)
+
+
+MODEL_CACHE = ModelCache()
@@ -8,6 +8,8 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from asset_loader import load_asset
+
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 DEFAULT_PATH = ASSETS / "students.csv"
 
@@ -17,7 +19,7 @@ def load_dataset(path: str = str(DEFAULT_PATH)) -> pd.DataFrame:
     """Load student data from CSV or generated fallback."""
     file = Path(path)
     if file.exists():
-        df = pd.read_csv(file)
+        df = load_asset(file)
     else:
         rng = np.random.default_rng(42)
         df = pd.DataFrame(
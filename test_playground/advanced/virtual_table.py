@@ -0,0 +1,150 @@
+"""Virtual Treeview table: only the visible rows exist as Tk items."""
+
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnStore:
+    """DataFrame columns as NumPy arrays plus a (sortable) row order."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns = [str(c) for c in df.columns]
+        self.arrays = [df[c].to_numpy() for c in df.columns]
+        self.order = np.arange(len(df))
+        self.sort_column: str | None = None
+        self.descending = False
+        self._argsorts: dict[str, np.ndarray] = {}  # column -> ascending argsort, built on first use
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _argsort(self, col: str) -> np.ndarray:
+        idx = self._argsorts.get(col)
+        if idx is None:
+            values = self.arrays[self.columns.index(col)]
+            if values.dtype == object:
+                # strings mixed with NaN cannot be compared; sort their text form instead
+                values = values.astype(str)
+            idx = np.argsort(values, kind="stable")
+            self._argsorts[col] = idx
+        return idx
+
+    def precompute(self) -> None:
+        """Build every column's argsort now (e.g. on a worker thread) so sorting is instant."""
+        for col in self.columns:
+            self._argsort(col)
+
+    def sort_by(self, col: str, descending: bool | None = None) -> None:
+        """Order rows by col; clicking the same column again flips the direction."""
+        if descending is None:
+            descending = not self.descending if col == self.sort_column else False
+        idx = self._argsort(col)
+        self.order = idx[::-1] if descending else idx  # reversed view, no copy
+        self.sort_column = col
+        self.descending = descending
+
+    def rows(self, start: int, stop: int) -> list[tuple]:
+        """Display tuples for rows [start, stop) in the current order."""
+        picked = self.order[start:stop]
+        return list(zip(*(arr[picked].tolist() for arr in self.arrays)))
+
+
+class VirtualTable(ttk.Frame):
+    """Treeview with a fixed pool of item rows that are refilled as the view scrolls."""
+
+    def __init__(self, master: tk.Misc, height: int = 18, column_width: int = 110):
+        super().__init__(master)
+        self.height = height
+        self.column_width = column_width
+        self.store: ColumnStore | None = None
+        self.top = 0
+        self._iids: list[str] = []
+        self._draw_pending = False
+
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.tree = ttk.Treeview(self, show="headings", height=height, selectmode="browse")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Prior>", lambda e: self.scroll(-self.height))
+        self.tree.bind("<Next>", lambda e: self.scroll(self.height))
+
+    def set_data(self, df: pd.DataFrame) -> None:
+        """Show df; the cost is one array per column, not one Tk item per row."""
+        self.set_store(ColumnStore(df))
+
+    def set_store(self, store: ColumnStore) -> None:
+        """Show an already built (possibly pre-sorted) column store."""
+        self.store = store
+        self.top = 0
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = self.store.columns
+        for col in self.store.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=self.column_width, anchor="center")
+        self._iids = [self.tree.insert("", "end", values=()) for _ in range(min(self.height, len(self.store)))]
+        self._draw()
+
+    def sort_by(self, col: str, descending: bool | None = None) -> None:
+        if self.store is None:
+            return
+        self.store.sort_by(col, descending)
+        for c in self.store.columns:
+            arrow = (" ▼" if self.store.descending else " ▲") if c == col else ""
+            self.tree.heading(c, text=c + arrow)
+        self.top = 0
+        self._schedule_draw()
+
+    def _max_top(self) -> int:
+        return max(0, len(self.store) - self.height) if self.store is not None else 0
+
+    def scroll_to(self, top: int) -> None:
+        """Make row `top` (in display order) the first visible row."""
+        top = min(max(0, int(top)), self._max_top())
+        if top != self.top:
+            self.top = top
+            self._schedule_draw()
+
+    def scroll(self, rows: int) -> None:
+        self.scroll_to(self.top + rows)
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str | None = None) -> None:
+        if self.store is None:
+            return
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.store))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll(-3)
+        else:
+            self.scroll(3)
+        return "break"  # the Treeview's own scrolling would move the item pool
+
+    def _schedule_draw(self) -> None:
+        # coalesce a burst of scroll events (scrollbar drag) into one redraw
+        if not self._draw_pending:
+            self._draw_pending = True
+            self.after_idle(self._draw)
+
+    def _draw(self) -> None:
+        self._draw_pending = False
+        if self.store is None:
+            return
+        rows = self.store.rows(self.top, self.top + len(self._iids))
+        for iid, values in zip(self._iids, rows):
+            self.tree.item(iid, values=values)
+        total = len(self.store) or 1
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + len(self._iids)) / total))
@@ -1,13 +1,18 @@
 """Generate final datasets used by workshop exercises."""
 
 import csv
-import json
+import importlib.util
 import random
 from datetime import date, timedelta
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 
+# shared codec from intermediate/, loaded by file path instead of editing sys.path
+_spec = importlib.util.spec_from_file_location("json_codec", ROOT.parent / "intermediate" / "json_codec.py")
+json_codec = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(json_codec)
+
 
 def generate_students(path: Path):
     # student table for pandas basics (includes stable student_id key)
@@ -68,8 +73,7 @@ def generate_algo_arrays(path: Path):
         "unsorted_lists": [[5, 1, 3, 2, 6, 4], [10, 9, 8, 7]],
         "windows": [[1, 3, 2, 5, 8, 7, 6], [4, 2, 12, 3, 6]],
     }
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    path.write_text(json_codec.dumps(payload, pretty=True), encoding="utf-8")
 
 
 def generate_sales(path: Path, days: int = 45, seed: int = 2):
@@ -129,7 +133,7 @@ def generate_cp_tests(path: Path):
         "max_subarray": [3, -2, 5, -1, 6, -3],
         "range_query": {"arr": [4, 2, 7, 1, 9, 3], "left": 1, "right": 4},
     }
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_text(json_codec.dumps(payload, pretty=True), encoding="utf-8")
 
 
 def generate_ds_sequences(path: Path):
@@ -139,7 +143,7 @@ def generate_ds_sequences(path: Path):
         "sequence_b": [7, 2, 9, 1, 5],
         "pairs": [["a", 1], ["b", 2], ["c", 3]],
     }
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_text(json_codec.dumps(payload, pretty=True), encoding="utf-8")
 
 
 def generate_cipher_cases(path: Path):
@@ -154,7 +158,7 @@ def generate_cipher_cases(path: Path):
             {"text": "Data Structures", "key": "KEY"},
         ],
     }
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_text(json_codec.dumps(payload, pretty=True), encoding="utf-8")
 
 
 def generate_chatbot_prompts(path: Path):
@@ -167,7 +171,7 @@ def generate_chatbot_prompts(path: Path):
             "quit",
         ]
     }
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_text(json_codec.dumps(payload, pretty=True), encoding="utf-8")
 
 
 if __name__ == "__main__":
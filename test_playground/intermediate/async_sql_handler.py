@@ -0,0 +1,193 @@
+"""Asyncio facade over the workshop SQLite DB (one writer thread, pooled readers)."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import queue
+import threading
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from sql_handler import ConnectionManager
+import sql_handler
+
+# (sql, params, future, loop) queued for the writer thread
+_WriteJob = Tuple[str, Sequence[Any], asyncio.Future, asyncio.AbstractEventLoop]
+
+
+# hand a result back to the coroutine waiting on fut
+def _resolve(fut: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    if fut.cancelled():
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
+class AsyncDB:
+    # writes are coalesced into shared transactions on one thread, reads use a thread pool
+    def __init__(self, path: Union[str, Path], readers: int = 4, max_batch: int = 1000):
+        self.path = Path(path)
+        self.max_batch = max_batch
+        self.transactions = 0
+        self.writes = 0
+        self._conns = ConnectionManager(self.path)
+        self._queue: "queue.Queue[Optional[_WriteJob]]" = queue.Queue()
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+        self._writer.start()
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> Tuple[int, int]:
+        """Queue a write statement and return (lastrowid, rowcount) once committed."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.put((sql, params, fut, loop))
+        return await fut
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        """Run a read query on a reader thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._fetchall, sql, params)
+
+    def _fetchall(self, sql: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        return self._conns.get().execute(sql, params).fetchall()
+
+    def _write_loop(self) -> None:
+        stop = False
+        while not stop:
+            job = self._queue.get()
+            if job is None:
+                break
+            batch = [job]
+            # drain whatever queued up meanwhile into the same transaction
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+            self._run_batch(batch)
+        self._conns.close()
+
+    def _run_batch(self, batch: List[_WriteJob]) -> None:
+        # any exception (not just sqlite3.Error, e.g. OverflowError while binding)
+        # must end up on the futures; if it escaped, the writer thread would die
+        # and every later write would wait forever
+        try:
+            outcomes = self._execute_batch(batch)
+        except Exception as exc:
+            outcomes = [(None, exc)] * len(batch)
+        self.writes += len(batch)
+        for (_, _, fut, loop), (result, error) in zip(batch, outcomes):
+            try:
+                loop.call_soon_threadsafe(_resolve, fut, result, error)
+            except RuntimeError:
+                pass  # caller's loop already closed
+
+    def _execute_batch(self, batch: List[_WriteJob]) -> List[Tuple[Any, Optional[BaseException]]]:
+        conn = self._conns.get()
+        try:
+            with conn:
+                outcomes = []
+                for sql, params, _, _ in batch:
+                    cur = conn.execute(sql, params)
+                    outcomes.append(((cur.lastrowid, cur.rowcount), None))
+            self.transactions += 1
+            return outcomes
+        except Exception:
+            pass
+        # one bad statement must not fail its neighbours: retry each on its own
+        outcomes = []
+        for sql, params, _, _ in batch:
+            try:
+                with conn:
+                    cur = conn.execute(sql, params)
+                outcomes.append(((cur.lastrowid, cur.rowcount), None))
+            except Exception as exc:
+                outcomes.append((None, exc))
+            self.transactions += 1
+        return outcomes
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer and reader threads."""
+        self._queue.put(None)
+        self._writer.join()
+        self._readers.shutdown(wait=True)
+        self._conns.close_all()
+
+
+_default: Optional[AsyncDB] = None
+_default_lock = threading.Lock()
+
+
+def get_async_db() -> AsyncDB:
+    """Return the shared AsyncDB bound to sql_handler.DB_PATH.
+
+    When DB_PATH changed, the old instance is closed on a background thread,
+    since close() joins its writer and must not block the event loop.
+    """
+    global _default
+    with _default_lock:
+        if _default is None or _default.path != Path(sql_handler.DB_PATH):
+            if _default is not None:
+                threading.Thread(target=_default.close, name="sqlite-close").start()
+            _default = AsyncDB(sql_handler.DB_PATH)
+        return _default
+
+
+def close_async_db() -> None:
+    """Close the shared AsyncDB if one is open."""
+    global _default
+    with _default_lock:
+        if _default is not None:
+            _default.close()
+            _default = None
+
+
+async def async_insert_item(name: str, price: float) -> int:
+    """Insert one item and return its id."""
+    rowid, _ = await get_async_db().execute("INSERT INTO items (name, price) VALUES (?, ?)", (name, float(price)))
+    return rowid
+
+
+async def async_query_items() -> List[Tuple[int, str, float]]:
+    """Return all items in ascending id order."""
+    return await get_async_db().fetchall("SELECT id, name, price FROM items ORDER BY id")
+
+
+async def async_update_item(item_id: int, name: str = None, price: float = None) -> bool:
+    """Update name and/or price of one item."""
+    updates = []
+    params: List[Any] = []
+    if name is not None:
+        updates.append("name = ?")
+        params.append(name)
+    if price is not None:
+        updates.append("price = ?")
+        params.append(float(price))
+    if not updates:
+        return False
+    params.append(item_id)
+    _, affected = await get_async_db().execute(f"UPDATE items SET {', '.join(updates)} WHERE id = ?", params)
+    return affected > 0
+
+
+async def async_delete_item(item_id: int) -> bool:
+    """Delete one item by id."""
+    _, affected = await get_async_db().execute("DELETE FROM items WHERE id = ?", (item_id,))
+    return affected > 0
+
+
+if __name__ == "__main__":
+    async def _demo() -> None:
+        new_id = await async_insert_item("Async sample", 4.5)
+        print("Inserted id", new_id)
+        print("Updated:", await async_update_item(new_id, price=5.0))
+        print("All items:", await async_query_items())
+
+    sql_handler.init_db()
+    asyncio.run(_demo())
+    close_async_db()
@@ -0,0 +1,179 @@
+"""SQLite ledger of checkouts: one bills row per checkout plus its bill_lines."""
+
+from datetime import datetime
+from pathlib import Path
+import csv
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Set, Union
+
+from json_codec import loads
+from sql_handler import ConnectionManager
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+ASSETS.mkdir(parents=True, exist_ok=True)
+LEDGER_PATH = ASSETS / "bills.db"
+BILLS_CSV = ASSETS / "bills.csv"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bills (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    created_at TEXT NOT NULL,  -- 'YYYY-MM-DD HH:MM:SS', local time
+    total REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bills_user ON bills (user, created_at);
+CREATE INDEX IF NOT EXISTS idx_bills_created ON bills (created_at, total);
+CREATE TABLE IF NOT EXISTS bill_lines (
+    bill_id INTEGER NOT NULL REFERENCES bills (id),
+    line_no INTEGER NOT NULL,
+    item_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    price REAL NOT NULL,
+    qty INTEGER NOT NULL,
+    line_total REAL NOT NULL,
+    PRIMARY KEY (bill_id, line_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_bill_lines_item ON bill_lines (item_id, qty, line_total);
+-- CSV files already imported, so running the importer twice is harmless
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    bills INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+_ready: Set[Path] = set()
+
+
+def get_ledger(path: Union[str, Path] = LEDGER_PATH) -> ConnectionManager:
+    """Return the shared connection manager for a ledger, creating its tables once."""
+    manager = ConnectionManager.shared(path)
+    if manager.path not in _ready:
+        conn = manager.get()
+        conn.executescript(SCHEMA)
+        conn.commit()
+        _ready.add(manager.path)
+    return manager
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _insert_bill(conn, user: str, items: Sequence[Dict[str, Any]], total: float, created_at: str) -> int:
+    cur = conn.execute(
+        "INSERT INTO bills (user, created_at, total) VALUES (?, ?, ?)", (user, created_at, round(float(total), 2))
+    )
+    bill_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO bill_lines VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (bill_id, n, row["item_id"], row["name"], row["price"], row["qty"], row["line_total"])
+            for n, row in enumerate(items)
+        ),
+    )
+    return bill_id
+
+
+def record_bill(
+    user: str,
+    items: Sequence[Dict[str, Any]],
+    total: float,
+    created_at: Optional[str] = None,
+    path: Union[str, Path] = LEDGER_PATH,
+) -> int:
+    """Write one bill and its lines in a single transaction; return the bill id.
+
+    items are CartManager.list_items() rows (item_id, name, price, qty, line_total).
+    """
+    with get_ledger(path).transaction() as conn:
+        return _insert_bill(conn, user, items, total, created_at or _now())
+
+
+def bill_lines(bill_id: int, path: Union[str, Path] = LEDGER_PATH) -> List[Dict[str, Any]]:
+    """Return the lines of one bill in cart order."""
+    cur = get_ledger(path).get().execute(
+        "SELECT item_id, name, price, qty, line_total FROM bill_lines WHERE bill_id = ? ORDER BY line_no",
+        (bill_id,),
+    )
+    return [dict(zip(("item_id", "name", "price", "qty", "line_total"), row)) for row in cur]
+
+
+def user_totals(user: Optional[str] = None, path: Union[str, Path] = LEDGER_PATH) -> List[Dict[str, Any]]:
+    """Bill count and amount spent per user (or for one user), biggest spenders first."""
+    sql = "SELECT user, COUNT(*), ROUND(SUM(total), 2) FROM bills"
+    params: List[Any] = []
+    if user is not None:
+        sql += " WHERE user = ?"
+        params.append(user)
+    sql += " GROUP BY user ORDER BY SUM(total) DESC"
+    cur = get_ledger(path).get().execute(sql, params)
+    return [{"user": u, "bills": n, "total": t} for u, n, t in cur]
+
+
+def top_products(limit: int = 5, by: str = "qty", path: Union[str, Path] = LEDGER_PATH) -> List[Dict[str, Any]]:
+    """Best-selling products ranked by units sold ("qty") or revenue ("revenue")."""
+    if by not in ("qty", "revenue"):
+        raise ValueError("by must be 'qty' or 'revenue'")
+    order = "SUM(qty)" if by == "qty" else "SUM(line_total)"
+    cur = get_ledger(path).get().execute(
+        f"""
+        SELECT item_id, MAX(name), SUM(qty), ROUND(SUM(line_total), 2)
+        FROM bill_lines GROUP BY item_id ORDER BY {order} DESC LIMIT ?
+        """,
+        (limit,),
+    )
+    return [{"item_id": i, "name": name, "qty": q, "revenue": r} for i, name, q, r in cur]
+
+
+def daily_revenue(
+    start: Optional[str] = None, end: Optional[str] = None, path: Union[str, Path] = LEDGER_PATH
+) -> List[Dict[str, Any]]:
+    """Bills and revenue per day, optionally for days in [start, end] ('YYYY-MM-DD')."""
+    conditions = []
+    params: List[Any] = []
+    # plain range conditions on created_at so idx_bills_created is used
+    if start is not None:
+        conditions.append("created_at >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("created_at < date(?, '+1 day')")
+        params.append(end)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    cur = get_ledger(path).get().execute(
+        f"SELECT substr(created_at, 1, 10) AS day, COUNT(*), ROUND(SUM(total), 2) FROM bills{where} "
+        "GROUP BY day ORDER BY day",
+        params,
+    )
+    return [{"day": d, "bills": n, "revenue": r} for d, n, r in cur]
+
+
+def import_bills_csv(csv_path: Union[str, Path] = BILLS_CSV, path: Union[str, Path] = LEDGER_PATH) -> int:
+    """Copy an old bills.csv (user, items JSON, total) into the ledger; return bills added.
+
+    The CSV has no timestamps, so imported bills are dated with the file's
+    mtime. A file that was already imported is skipped.
+    """
+    csv_path = Path(csv_path).resolve()
+    if not csv_path.exists():
+        return 0
+    created_at = datetime.fromtimestamp(csv_path.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+    count = 0
+    with get_ledger(path).transaction() as conn:
+        if conn.execute("SELECT 1 FROM imports WHERE path = ?", (str(csv_path),)).fetchone():
+            return 0
+        with csv_path.open("r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                _insert_bill(conn, row["user"], loads(row["items"]), float(row["total"]), created_at)
+                count += 1
+        conn.execute("INSERT INTO imports VALUES (?, ?, ?)", (str(csv_path), count, _now()))
+    return count
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "import":
+        source = Path(sys.argv[2]) if len(sys.argv) > 2 else BILLS_CSV
+        print(f"imported {import_bills_csv(source)} bills from {source}")
+    print("per user:", user_totals())
+    print("top products:", top_products())
+    print("daily revenue:", daily_revenue())
@@ -1,9 +1,16 @@
 """Practice shopping cart flow with Tkinter UI."""
 
+from collections import OrderedDict
 from pathlib import Path
-import csv
-import json
-from typing import Any, Dict, List
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from json_codec import dumps, loads
+from json_handler import atomic_write_text
+from bill_ledger import record_bill
+from file_lock import file_lock
 
 try:
     import tkinter as tk
@@ -15,7 +22,10 @@ except ImportError:  # pragma: no cover
 
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 ASSETS.mkdir(parents=True, exist_ok=True)
-BILLS_CSV = ASSETS / "bills.csv"
+BILLS_CSV = ASSETS / "bills.csv"  # legacy; load it with bill_ledger.import_bills_csv
+LEDGER_PATH = ASSETS / "bills.db"
+FLUSH_DELAY = 2.0  # ShoppingApp: seconds without edits before a dirty cart is written
+CART_CACHE_SIZE = 32  # live carts kept by ShoppingApp for quick user switching
 
 PRODUCTS = {
     1: {"name": "Notebook", "price": 45.0},
@@ -38,23 +48,146 @@ def normalize_user_id(user_id: str) -> str:
 
 
 class CartManager:
-    # manage per-user cart in JSON file
-    def __init__(self, user_id: str):
+    # per-user cart kept as item_id -> qty; saved on every edit, or once edits go
+    # idle for flush_delay seconds (then close() must run before exit).
+    # Edits are kept as ops and merged into the file under a lock, so several
+    # processes can share one cart without losing each other's changes.
+    def __init__(self, user_id: str, flush_delay: Optional[float] = None):
         self.user_id = user_id
         self.path = ASSETS / f"cart_{user_id}.json"
-        self.cart: Dict[str, Any] = {"items": []}
+        self.flush_delay = flush_delay
+        self.items: Dict[int, int] = {}
+        self._pending: Dict[int, Tuple[str, int]] = {}  # unsaved ("add", n) / ("set", qty) per item
+        self._price_sum = 0.0  # one unit price per cart line
+        self._line_sum = 0.0  # sum of price * qty
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._last_change = 0.0
         self.load()
 
+    @property
+    def cart(self) -> Mapping[str, Any]:
+        """Read-only view of the cart in its on-disk shape: {"items": ({"item_id", "qty"}, ...)}.
+
+        Edit through add_item/set_qty/remove_item, or assign a whole new cart
+        dict to replace the contents; changing the view itself raises.
+        """
+        rows = tuple(MappingProxyType({"item_id": item_id, "qty": qty}) for item_id, qty in self.items.items())
+        return MappingProxyType({"items": rows})
+
+    @cart.setter
+    def cart(self, value: Mapping[str, Any]) -> None:
+        items: Dict[int, int] = {}
+        for row in value["items"]:
+            item_id = int(row["item_id"])
+            items[item_id] = items.get(item_id, 0) + row["qty"]
+        items = {item_id: qty for item_id, qty in items.items() if qty > 0}
+        with self._lock:
+            for item_id in self.items.keys() - items.keys():
+                self._pending[item_id] = ("set", 0)
+            for item_id, qty in items.items():
+                self._pending[item_id] = ("set", qty)
+            self._set_items(items)
+            self._schedule_save()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    @staticmethod
+    def _price(item_id: int) -> float:
+        return PRODUCTS.get(item_id, {"price": 0.0})["price"]
+
+    def _read_disk(self) -> Dict[int, int]:
+        items: Dict[int, int] = {}
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return items  # no cart yet, or another worker just checked it out
+        for row in loads(raw)["items"]:
+            item_id = int(row["item_id"])
+            items[item_id] = items.get(item_id, 0) + row["qty"]
+        return items
+
+    def _merged(self, items: Dict[int, int]) -> Dict[int, int]:
+        # replay unsaved edits over what is on disk now
+        for item_id, (op, n) in self._pending.items():
+            if op == "add":
+                items[item_id] = items.get(item_id, 0) + n
+            elif n > 0:
+                items[item_id] = n
+            else:
+                items.pop(item_id, None)
+        return items
+
+    def _set_items(self, items: Dict[int, int]) -> None:
+        self.items = items
+        self._price_sum = sum(self._price(i) for i in items)
+        self._line_sum = sum(self._price(i) * q for i, q in items.items())
+
     def load(self) -> None:
-        """Load cart from disk if present."""
-        if self.path.exists():
-            self.cart = json.loads(self.path.read_text(encoding="utf-8"))
-        else:
-            self.cart = {"items": []}
+        """Load cart from disk if present (unsaved edits are kept on top)."""
+        with self._lock:
+            self._set_items(self._merged(self._read_disk()))
 
     def save(self) -> None:
-        """Persist cart to disk."""
-        self.path.write_text(json.dumps(self.cart, indent=2), encoding="utf-8")
+        """Merge edits into the file under its lock and atomically replace it."""
+        with self._lock, file_lock(self.path):
+            items = self._merged(self._read_disk())
+            atomic_write_text(self.path, dumps({"items": [{"item_id": i, "qty": q} for i, q in items.items()]}))
+            self._pending = {}
+            self._set_items(items)
+
+    def flush(self) -> bool:
+        """Save only if there are unsaved edits; return whether it wrote."""
+        with self._lock:
+            if not self.dirty:
+                return False
+            self.save()
+            return True
+
+    def close(self) -> None:
+        """Stop the idle timer and write any pending edits."""
+        with self._lock:
+            self._cancel_timer()
+            self.flush()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _touched(self, item_id: int, op: str, n: int) -> None:
+        # record the edit, then save it now or later
+        prev = self._pending.get(item_id)
+        if op == "add" and prev is not None:
+            op, n = prev[0], prev[1] + n  # add folds into an earlier add or set
+        self._pending[item_id] = (op, n)
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        # with a flush delay: one timer thread per idle period, not one per edit
+        self._last_change = time.monotonic()
+        if self.flush_delay is None:
+            self.save()
+        elif self._timer is None:
+            self._start_timer(self.flush_delay)
+
+    def _start_timer(self, delay: float) -> None:
+        self._timer = threading.Timer(delay, self._on_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_idle(self) -> None:
+        with self._lock:
+            if self._timer is None:
+                return  # cancelled while we waited for the lock
+            remaining = self._last_change + self.flush_delay - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)  # edited since the timer started
+                return
+            self._timer = None
+            self.flush()
 
     def add_item(self, item_id: int, qty: int = 1) -> None:
         """Add product and quantity to cart."""
@@ -63,67 +196,152 @@ class CartManager:
         if qty <= 0:
             raise ValueError("qty must be positive")
 
-        for row in self.cart["items"]:
-            if row["item_id"] == item_id:
-                row["qty"] += qty
-                self.save()
-                return
+        with self._lock:
+            price = self._price(item_id)
+            if item_id not in self.items:
+                self.items[item_id] = 0
+                self._price_sum += price
+            self.items[item_id] += qty
+            self._line_sum += price * qty
+            self._touched(item_id, "add", qty)
+
+    def set_qty(self, item_id: int, qty: int) -> None:
+        """Set the quantity of one product; qty <= 0 removes the line."""
+        if qty <= 0:
+            self.remove_item(item_id)
+            return
+        if item_id not in PRODUCTS:
+            raise ValueError("invalid item id")
 
-        self.cart["items"].append({"item_id": item_id, "qty": qty})
-        self.save()
+        with self._lock:
+            price = self._price(item_id)
+            old = self.items.get(item_id)
+            if old is None:
+                old = 0
+                self._price_sum += price
+            self.items[item_id] = qty
+            self._line_sum += price * (qty - old)
+            self._touched(item_id, "set", qty)
 
     def remove_item(self, item_id: int) -> bool:
         """Remove one product row from cart."""
-        before = len(self.cart["items"])
-        self.cart["items"] = [row for row in self.cart["items"] if row["item_id"] != item_id]
-        changed = len(self.cart["items"]) != before
-        if changed:
-            self.save()
-        return changed
+        with self._lock:
+            qty = self.items.pop(item_id, None)
+            if qty is None:
+                return False
+            price = self._price(item_id)
+            self._price_sum -= price
+            self._line_sum -= price * qty
+            if not self.items:
+                self._price_sum = self._line_sum = 0.0  # drop float drift
+            self._touched(item_id, "set", 0)
+            return True
 
     def clear(self) -> None:
         """Clear cart and delete file."""
-        self.cart = {"items": []}
+        with self._lock, file_lock(self.path):
+            self._drop()
+
+    def _drop(self) -> None:
+        self._cancel_timer()
+        self._pending = {}
+        self._set_items({})
         if self.path.exists():
             self.path.unlink()
 
+    @staticmethod
+    def _expand(item_id: int, qty: int) -> Dict[str, Any]:
+        item = PRODUCTS.get(item_id, {"name": "Unknown", "price": 0.0})
+        return {
+            "item_id": item_id,
+            "name": item["name"],
+            "price": item["price"],
+            "qty": qty,
+            "line_total": item["price"] * qty,
+        }
+
+    def line(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Return one expanded cart row, or None if the item is not in the cart."""
+        qty = self.items.get(item_id)
+        return None if qty is None else self._expand(item_id, qty)
+
     def list_items(self) -> List[Dict[str, Any]]:
         """Return expanded cart rows for display."""
-        out: List[Dict[str, Any]] = []
-        for row in self.cart["items"]:
-            item = PRODUCTS.get(row["item_id"], {"name": "Unknown", "price": 0.0})
-            out.append(
-                {
-                    "item_id": row["item_id"],
-                    "name": item["name"],
-                    "price": item["price"],
-                    "qty": row["qty"],
-                    "line_total": item["price"] * row["qty"],
-                }
-            )
-        return out
+        return [self._expand(item_id, qty) for item_id, qty in self.items.items()]
 
     def total(self) -> float:
         """Return cart grand total."""
-        return sum(row["price"] for row in self.list_items())  # HINT: should sum line_total, not base price
+        return self._price_sum  # HINT: should return the running line_total sum, not base price
 
     def checkout(self) -> Dict[str, Any]:
-        """Write bill row and clear cart."""
-        items = self.list_items()
-        total = self.total()
-        summary = {"user": self.user_id, "items": items, "total": round(total, 2)}
-
-        exists = BILLS_CSV.exists()
-        with BILLS_CSV.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if not exists:
-                writer.writerow(["user", "items", "total"])
-            writer.writerow([self.user_id, json.dumps(items), f"{total:.2f}"])
-
-        self.clear()
+        """Record the bill in the ledger and clear cart."""
+        # hold the cart lock throughout so two workers cannot bill the same lines
+        with self._lock, file_lock(self.path):
+            self._set_items(self._merged(self._read_disk()))
+            self._pending = {}
+            items = self.list_items()
+            total = self.total()
+            summary = {"user": self.user_id, "items": items, "total": round(total, 2)}
+            summary["bill_id"] = record_bill(self.user_id, items, total, path=LEDGER_PATH) if items else None
+            self._drop()
         return summary
 
 
+class CartCache:
+    # LRU of live CartManager objects, so switching back to a recent user skips the disk
+    def __init__(
+        self, max_carts: int = CART_CACHE_SIZE, max_lines: Optional[int] = None, flush_delay: Optional[float] = None
+    ):
+        if max_carts <= 0:
+            raise ValueError("max_carts must be positive")
+        self.max_carts = max_carts
+        self.max_lines = max_lines  # optional cap on cart lines held across all cached carts
+        self.flush_delay = flush_delay
+        self._carts: "OrderedDict[str, CartManager]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._carts)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._carts
+
+    def get(self, user_id: str) -> CartManager:
+        """Return the cached cart for user_id, loading it (and evicting the oldest) on a miss."""
+        cart = self._carts.get(user_id)
+        if cart is not None:
+            self._carts.move_to_end(user_id)
+            self.hits += 1
+            return cart
+        self.misses += 1
+        cart = CartManager(user_id, flush_delay=self.flush_delay)
+        self._carts[user_id] = cart
+        self._evict()
+        return cart
+
+    def _evict(self) -> None:
+        # least recently used first; the newest cart always stays
+        lines = sum(len(c.items) for c in self._carts.values()) if self.max_lines is not None else 0
+        while len(self._carts) > 1 and (
+            len(self._carts) > self.max_carts or (self.max_lines is not None and lines > self.max_lines)
+        ):
+            _, cart = self._carts.popitem(last=False)
+            lines -= len(cart.items)
+            cart.close()  # write back unsaved edits
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size."""
+        return {"size": len(self._carts), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def close(self) -> None:
+        """Write back and drop every cached cart."""
+        while self._carts:
+            self._carts.popitem(last=False)[1].close()
+
+
 class ShoppingApp(tk.Tk):
     # Tkinter app kept clean and fully working
     def __init__(self):
@@ -136,7 +354,11 @@ class ShoppingApp(tk.Tk):
         self.item_var = tk.StringVar(value="1")
         self.qty_var = tk.StringVar(value="1")
 
-        self.cart_manager = CartManager(self.user_var.get())
+        self.carts = CartCache(CART_CACHE_SIZE, flush_delay=FLUSH_DELAY)
+        self.cart_manager = self.carts.get(self.user_var.get())
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._iids: Dict[int, str] = {}  # item_id -> tree row id
+        self._shown: Dict[int, Tuple[Any, ...]] = {}  # item_id -> values currently displayed
 
         self._build_layout()
         self.refresh_cart_view()
@@ -198,8 +420,9 @@ class ShoppingApp(tk.Tk):
         if not user_id:
             messagebox.showerror("Invalid user", "User ID cannot be empty")
             return
-        self.cart_manager = CartManager(user_id)
-        self.refresh_cart_view()
+        self.cart_manager.flush()  # stays cached; only unsaved edits hit the disk
+        self.cart_manager = self.carts.get(user_id)
+        self.reset_cart_view()
 
     def add_selected_item(self) -> None:
         # add chosen product with quantity
@@ -207,30 +430,50 @@ class ShoppingApp(tk.Tk):
             item_id = self._selected_item_id()
             qty = int(self.qty_var.get())
             self.cart_manager.add_item(item_id, qty)
-            self.refresh_cart_view()
+            self.refresh_cart_view([item_id])
             self.qty_var.set("1")
         except ValueError as exc:
             messagebox.showerror("Input error", str(exc))
 
-    def refresh_cart_view(self) -> None:
-        # redraw tree rows and total
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-
-        for row in self.cart_manager.list_items():
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    row["item_id"],
-                    row["name"],
-                    f"{row['price']:.2f}",
-                    row["qty"],
-                    f"{row['line_total']:.2f}",
-                ),
-            )
-
-        self.total_label.config(text=f"Total: Rs {self.cart_manager.total():.2f}")
+    @staticmethod
+    def _row_values(row: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (row["item_id"], row["name"], f"{row['price']:.2f}", row["qty"], f"{row['line_total']:.2f}")
+
+    def refresh_cart_view(self, changed: Optional[Iterable[int]] = None) -> None:
+        # sync tree rows with the cart, touching only rows whose values changed;
+        # changed limits the check to those item ids (None compares every row)
+        cart = self.cart_manager
+        if changed is None:
+            ids = list(cart.items) + [i for i in self._iids if i not in cart.items]
+        else:
+            ids = list(changed)
+
+        gone: List[str] = []
+        for item_id in ids:
+            row = cart.line(item_id)
+            iid = self._iids.get(item_id)
+            if row is None:
+                if iid is not None:
+                    gone.append(self._iids.pop(item_id))
+                    del self._shown[item_id]
+                continue
+            values = self._row_values(row)
+            if iid is None:
+                self._iids[item_id] = self.tree.insert("", "end", values=values)
+            elif self._shown[item_id] != values:
+                self.tree.item(iid, values=values)
+            self._shown[item_id] = values
+        if gone:
+            self.tree.delete(*gone)  # one Tcl call for all removed rows
+
+        self.total_label.config(text=f"Total: Rs {cart.total():.2f}")
+
+    def reset_cart_view(self) -> None:
+        # drop every row and redraw, e.g. when a different cart is shown
+        self.tree.delete(*self.tree.get_children())
+        self._iids.clear()
+        self._shown.clear()
+        self.refresh_cart_view()
 
     def remove_selected(self) -> None:
         # remove selected product row
@@ -242,7 +485,7 @@ class ShoppingApp(tk.Tk):
         values = self.tree.item(selected[0], "values")
         item_id = int(values[0])
         self.cart_manager.remove_item(item_id)
-        self.refresh_cart_view()
+        self.refresh_cart_view([item_id])
 
     def clear_cart(self) -> None:
         # clear current user cart
@@ -262,6 +505,11 @@ class ShoppingApp(tk.Tk):
             f"User: {summary['user']}\nItems: {len(summary['items'])}\nTotal: Rs {summary['total']:.2f}",
         )
 
+    def on_close(self) -> None:
+        # write pending cart edits before the window goes away
+        self.carts.close()
+        self.destroy()
+
 
 def run_tk_app() -> None:
     """Start Tkinter shopping app."""
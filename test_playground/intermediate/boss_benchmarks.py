@@ -0,0 +1,167 @@
+"""Timing check for ShoppingApp.refresh_cart_view on a large cart.
+
+Fills a cart with 5,000 lines, then changes 1/10/100/1000 of them and times
+the diff-based refresh against the old delete-everything-and-reinsert
+redraw. The diff refresh should scale with the changed rows, the redraw
+with the cart size. The timings need a display (Tk); count_tree_calls runs
+the same refreshes headless against a counting stand-in for the Treeview
+and checks that the number of tree calls equals the number of changed rows.
+
+Usage: python boss_benchmarks.py [lines]
+"""
+
+from contextlib import contextmanager
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+import boss
+from cart_stress import use_assets
+
+
+@contextmanager
+def bench_cart(lines: int) -> Iterator[boss.CartManager]:
+    """A cart with `lines` products in a temporary assets dir; restores boss globals after."""
+    saved_products = dict(boss.PRODUCTS)
+    saved_assets = (boss.ASSETS, boss.LEDGER_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        use_assets(tmp)
+        cart = boss.CartManager("bench", flush_delay=60.0)
+        try:
+            boss.PRODUCTS.update({pid: {"name": f"Item {pid}", "price": 1.0 + pid % 50} for pid in range(5, 5 + lines)})
+            for pid in range(5, 5 + lines):
+                cart.add_item(pid, 1)
+            yield cart
+        finally:
+            cart.clear()
+            cart.close()
+            boss.ASSETS, boss.LEDGER_PATH = saved_assets
+            boss.PRODUCTS.clear()
+            boss.PRODUCTS.update(saved_products)
+
+
+class CountingTree:
+    """Records the Treeview calls refresh_cart_view makes, without Tk."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, Tuple[Any, ...]] = {}
+        self.calls: List[str] = []
+
+    def insert(self, parent: str, index: str, values: Tuple[Any, ...]) -> str:
+        self.calls.append("insert")
+        iid = f"I{len(self.rows) + len(self.calls)}"
+        self.rows[iid] = values
+        return iid
+
+    def item(self, iid: str, values: Tuple[Any, ...]) -> None:
+        self.calls.append("item")
+        self.rows[iid] = values
+
+    def delete(self, *iids: str) -> None:
+        self.calls.append("delete")
+        for iid in iids:
+            del self.rows[iid]
+
+    def get_children(self) -> Tuple[str, ...]:
+        return tuple(self.rows)
+
+
+class _Label:
+    def config(self, **kwargs: Any) -> None:
+        pass
+
+
+def headless_view(cart: boss.CartManager) -> "boss.ShoppingApp":
+    # just the state refresh_cart_view reads, without creating a Tk window
+    view = boss.ShoppingApp.__new__(boss.ShoppingApp)
+    view.cart_manager = cart
+    view.tree = CountingTree()
+    view.total_label = _Label()
+    view._iids = {}
+    view._shown = {}
+    return view
+
+
+def count_tree_calls(lines: int = 5000) -> Dict[int, Tuple[int, int]]:
+    """Tree calls per refresh after changing k rows: k -> (ids given, full compare)."""
+    results: Dict[int, Tuple[int, int]] = {}
+    with bench_cart(lines) as cart:
+        view = headless_view(cart)
+        view.refresh_cart_view()
+        if len(view.tree.calls) != lines:
+            raise AssertionError(f"first draw made {len(view.tree.calls)} tree calls for {lines} rows")
+        for changed in (0, 1, 10, 100, 1000):
+            ids = list(range(5, 5 + changed))
+            counts = []
+            for given in (ids, None):
+                for pid in ids:
+                    cart.add_item(pid, 1)
+                view.tree.calls.clear()
+                view.refresh_cart_view(given)
+                counts.append(len(view.tree.calls))
+            if counts != [changed, changed]:
+                raise AssertionError(f"{changed} changed rows cost {counts} tree calls, expected {changed}")
+            results[changed] = (counts[0], counts[1])
+        if len(view.tree.get_children()) != lines:
+            raise AssertionError("tree and cart disagree after diff refreshes")
+    return results
+
+
+# the pre-diff refresh: drop every row and insert the whole cart again
+def full_redraw(app: "boss.ShoppingApp") -> None:
+    for iid in app.tree.get_children():
+        app.tree.delete(iid)
+    for row in app.cart_manager.list_items():
+        app.tree.insert("", "end", values=app._row_values(row))
+    app.total_label.config(text=f"Total: Rs {app.cart_manager.total():.2f}")
+
+
+def bench_refresh(lines: int = 5000) -> Dict[str, float]:
+    """Time refreshes after changing k of `lines` cart rows (ms)."""
+    results: Dict[str, float] = {}
+    with bench_cart(lines) as cart:
+        app = boss.ShoppingApp()
+        app.withdraw()
+        try:
+            app.carts.close()
+            app.cart_manager = cart
+            app.reset_cart_view()
+            app.update_idletasks()
+
+            start = time.perf_counter()
+            full_redraw(app)
+            results[f"full redraw ({lines} rows)"] = (time.perf_counter() - start) * 1000
+            app.reset_cart_view()
+
+            for changed in (1, 10, 100, 1000):
+                ids = list(range(5, 5 + changed))
+                for pid in ids:
+                    cart.add_item(pid, 1)
+                start = time.perf_counter()
+                app.refresh_cart_view(ids)
+                results[f"diff, {changed} changed (ids given)"] = (time.perf_counter() - start) * 1000
+
+                for pid in ids:
+                    cart.add_item(pid, 1)
+                start = time.perf_counter()
+                app.refresh_cart_view()
+                results[f"diff, {changed} changed (full compare)"] = (time.perf_counter() - start) * 1000
+
+            if len(app.tree.get_children()) != lines:
+                raise AssertionError("tree and cart disagree after diff refreshes")
+        finally:
+            app.destroy()
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    for k, (given, compared) in count_tree_calls(n).items():
+        print(f"{k:>5} changed: {given} tree calls (ids given), {compared} (full compare)")
+    try:
+        timings = bench_refresh(n)
+    except boss.tk.TclError as exc:
+        sys.exit(f"timings need a display for Tk: {exc}")
+    for label, ms in timings.items():
+        print(f"{label:>36}: {ms:8.2f} ms")
@@ -0,0 +1,156 @@
+"""Headless load generator for CartManager (no Tkinter needed).
+
+Simulates users doing a weighted mix of add/set/remove/checkout against a
+temporary assets directory, optionally split across a process pool, and
+reports throughput, per-operation latency and bytes written.
+
+Usage: python cart_load.py [users] [ops_per_user] [processes]
+"""
+
+import multiprocessing as mp
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import boss
+from cart_stress import use_assets
+
+DEFAULT_MIX = {"add": 0.6, "set": 0.15, "remove": 0.15, "checkout": 0.1}
+
+
+def _written_bytes() -> Optional[int]:
+    # bytes passed to write() by this process so far (Linux only)
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def zipf_weights(s: float = 1.2) -> Dict[int, float]:
+    """Skewed product popularity: the first products in PRODUCTS sell most."""
+    return {pid: 1 / rank**s for rank, pid in enumerate(boss.PRODUCTS, 1)}
+
+
+def _run_users(
+    args: Tuple[str, List[str], int, Dict[str, float], Optional[Dict[int, float]], Optional[float], int]
+) -> Tuple[Dict[str, List[float]], int]:
+    assets, users, ops, mix, weights, flush_delay, seed = args
+    use_assets(assets)
+    rng = random.Random(seed)
+    kinds, kind_weights = list(mix), list(mix.values())
+    products = list(weights or boss.PRODUCTS)
+    product_weights = list(weights.values()) if weights else None
+    latencies: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    before = _written_bytes() or 0
+
+    carts = [boss.CartManager(user, flush_delay=flush_delay) for user in users]
+    for _ in range(ops):
+        for cart in carts:
+            kind = rng.choices(kinds, kind_weights)[0]
+            item_id = rng.choices(products, product_weights)[0]
+            start = time.perf_counter()
+            if kind == "add":
+                cart.add_item(item_id, rng.randint(1, 3))
+            elif kind == "set":
+                cart.set_qty(item_id, rng.randint(1, 10))
+            elif kind == "remove":
+                cart.remove_item(item_id)
+            else:
+                cart.checkout()
+            latencies[kind].append(time.perf_counter() - start)
+    for cart in carts:
+        start = time.perf_counter()
+        cart.close()
+        latencies.setdefault("close", []).append(time.perf_counter() - start)
+    return latencies, (_written_bytes() or 0) - before
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def simulate(
+    users: int = 50,
+    ops_per_user: int = 200,
+    mix: Optional[Dict[str, float]] = None,
+    weights: Optional[Dict[int, float]] = None,
+    processes: int = 1,
+    flush_delay: Optional[float] = None,
+    seed: int = 0,
+    assets: Optional[str] = None,
+) -> Dict[str, object]:
+    """Drive users carts through ops_per_user random operations each; return stats.
+
+    mix maps operation -> probability (add, set, remove, checkout), weights
+    maps product id -> popularity (uniform when None, see zipf_weights).
+    Users are dealt round-robin to processes; processes=1 runs in-process.
+    flush_delay is passed to CartManager (None saves on every edit).
+    """
+    mix = mix or DEFAULT_MIX
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise ValueError(f"unknown operations in mix: {sorted(unknown)}")
+    names = [f"load{u:04d}" for u in range(users)]
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [
+            (assets or tmp, names[w::processes], ops_per_user, mix, weights, flush_delay, seed + w)
+            for w in range(processes)
+        ]
+        start = time.perf_counter()
+        if processes == 1:
+            # in-process run: put boss back on the real assets afterwards
+            previous = (boss.ASSETS, boss.LEDGER_PATH)
+            try:
+                results = [_run_users(jobs[0])]
+            finally:
+                boss.ASSETS, boss.LEDGER_PATH = previous
+        else:
+            with mp.get_context("spawn").Pool(processes) as pool:
+                results = pool.map(_run_users, jobs)
+        elapsed = time.perf_counter() - start
+
+    merged: Dict[str, List[float]] = {}
+    for latencies, _ in results:
+        for kind, values in latencies.items():
+            merged.setdefault(kind, []).extend(values)
+    ops = sum(len(v) for k, v in merged.items() if k != "close")
+    per_op = {}
+    for kind, values in merged.items():
+        if not values:
+            continue  # weight 0 in the mix, or never drawn
+        values.sort()
+        per_op[kind] = {
+            "count": len(values),
+            "p50_ms": _percentile(values, 0.50) * 1000,
+            "p99_ms": _percentile(values, 0.99) * 1000,
+        }
+    return {
+        "ops": ops,
+        "seconds": elapsed,
+        "ops_per_sec": ops / elapsed,
+        "bytes_written": sum(written for _, written in results),
+        "per_op": per_op,
+    }
+
+
+def report(stats: Dict[str, object]) -> None:
+    """Print simulate() results as a small table."""
+    print(f"{stats['ops']:,} ops in {stats['seconds']:.2f} s = {stats['ops_per_sec']:,.0f} ops/sec, "
+          f"{stats['bytes_written'] / 1e6:,.1f} MB written")
+    for kind, row in stats["per_op"].items():
+        print(f"{kind:>9}: n={row['count']:>7,}  p50 {row['p50_ms']:8.3f} ms  p99 {row['p99_ms']:8.3f} ms")
+
+
+if __name__ == "__main__":
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    n_ops = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    n_proc = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    for label, delay in (("save on every edit", None), ("coalesced saves", boss.FLUSH_DELAY)):
+        print(f"-- {label}, {n_users} users, zipf products, {n_proc} process(es)")
+        report(simulate(n_users, n_ops, weights=zipf_weights(), processes=n_proc, flush_delay=delay))
@@ -0,0 +1,112 @@
+"""Multi-process stress check for CartManager and the bill ledger.
+
+Each worker process edits a shared cart and its own cart and checks them out,
+all against one temporary assets directory. Afterwards the ledger must
+account for every unit added: nothing lost, nothing billed twice, no torn
+bills.
+
+Usage: python cart_stress.py [processes] [rounds]
+"""
+
+import multiprocessing as mp
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Dict, Tuple
+
+import bill_ledger
+import boss
+
+SHARED_USER = "shared"
+
+
+def use_assets(assets: str) -> None:
+    """Point this process's carts and ledger at another assets directory."""
+    boss.ASSETS = Path(assets)
+    boss.LEDGER_PATH = boss.ASSETS / "bills.db"
+
+
+def _worker(args: Tuple[str, int, int]) -> Tuple[Dict[int, int], Dict[int, float]]:
+    assets, worker, rounds = args
+    use_assets(assets)
+    added: Dict[int, int] = {}
+    totals: Dict[int, float] = {}  # bill id -> total that checkout() reported
+
+    def checkout(cart: boss.CartManager) -> None:
+        summary = cart.checkout()
+        if summary["bill_id"] is not None:
+            totals[summary["bill_id"]] = summary["total"]
+
+    own = boss.CartManager(f"w{worker:02d}", flush_delay=None)
+    shared = boss.CartManager(SHARED_USER, flush_delay=None)
+    for r in range(rounds):
+        item_id = 1 + (worker + r) % len(boss.PRODUCTS)
+        own.add_item(item_id, 2)
+        own.add_item(1, 1)
+        checkout(own)
+        shared.add_item(item_id, 1)
+        added[item_id] = added.get(item_id, 0) + 1
+        if r % 5 == 4:
+            checkout(shared)  # bills whatever every worker has added so far
+    shared.close()
+    return added, totals
+
+
+def run(processes: int = 32, rounds: int = 20) -> Dict[str, float]:
+    """Hammer one assets dir from many processes, verify the ledger, return stats."""
+    with tempfile.TemporaryDirectory() as tmp:
+        use_assets(tmp)
+        bill_ledger.get_ledger(boss.LEDGER_PATH)  # create tables before the workers race for it
+        bill_ledger.get_ledger(boss.LEDGER_PATH).close_all()
+
+        start = time.perf_counter()
+        with mp.get_context("spawn").Pool(processes) as pool:
+            per_worker = pool.map(_worker, [(tmp, w, rounds) for w in range(processes)])
+        elapsed = time.perf_counter() - start
+
+        # whatever the last shared checkout missed is still in the cart file
+        leftover = boss.CartManager(SHARED_USER, flush_delay=None).items
+        expected: Dict[int, int] = {}
+        for added, _ in per_worker:
+            for item_id, qty in added.items():
+                expected[item_id] = expected.get(item_id, 0) + qty
+
+        conn = bill_ledger.get_ledger(boss.LEDGER_PATH).get()
+        billed = dict(
+            conn.execute(
+                "SELECT l.item_id, SUM(l.qty) FROM bill_lines AS l JOIN bills AS b ON b.id = l.bill_id "
+                "WHERE b.user = ? GROUP BY l.item_id",
+                (SHARED_USER,),
+            ).fetchall()
+        )
+        for item_id, qty in leftover.items():
+            billed[item_id] = billed.get(item_id, 0) + qty
+        if billed != expected:
+            raise AssertionError(f"shared cart lost or double-billed units: {billed} != {expected}")
+
+        own_bills = conn.execute("SELECT COUNT(*) FROM bills WHERE user != ?", (SHARED_USER,)).fetchone()[0]
+        if own_bills != processes * rounds:
+            raise AssertionError(f"expected {processes * rounds} bills, found {own_bills}")
+        # structural checks only, so they hold whichever formula CartManager.total() uses
+        torn = conn.execute(
+            "SELECT COUNT(*) FROM bills AS b WHERE NOT EXISTS (SELECT 1 FROM bill_lines WHERE bill_id = b.id)"
+        ).fetchone()[0]
+        torn += conn.execute("SELECT COUNT(*) FROM bill_lines WHERE ABS(line_total - price * qty) > 1e-6").fetchone()[0]
+        if torn:
+            raise AssertionError(f"{torn} bills or lines are incomplete")
+        reported = {bill_id: total for _, totals in per_worker for bill_id, total in totals.items()}
+        stored = dict(conn.execute("SELECT id, total FROM bills").fetchall())
+        if stored.keys() != reported.keys() or any(abs(stored[b] - reported[b]) > 0.005 for b in stored):
+            raise AssertionError("ledger bills do not match what checkout() returned")
+        total_bills = conn.execute("SELECT COUNT(*) FROM bills").fetchone()[0]
+        bill_ledger.get_ledger(boss.LEDGER_PATH).close_all()
+    return {"seconds": elapsed, "bills": total_bills, "checkouts/sec": total_bills / elapsed}
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    stats = run(n, rounds)
+    print(f"{n} processes x {rounds} rounds: {stats['bills']} bills in {stats['seconds']:.2f} s "
+          f"({stats['checkouts/sec']:.0f} checkouts/sec), no lost or torn bills")
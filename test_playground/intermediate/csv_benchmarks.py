@@ -0,0 +1,141 @@
+"""Benchmarks for the CSV helpers in csv_handler.py.
+
+Usage: python csv_benchmarks.py [size_mb]
+"""
+
+import csv
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict
+
+import csv_handler
+from csv_index import index_path
+
+
+# write a synthetic csv of roughly size_mb megabytes
+def make_csv(path: Path, size_mb: int) -> int:
+    rows = 0
+    target = size_mb * 1024 * 1024
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "region", "units", "price"])
+        while f.tell() < target:
+            writer.writerows([[rows + i, f"name{rows + i}", "North", i % 80, 19.5] for i in range(10_000)])
+            rows += 10_000
+    return rows
+
+
+def bench_row_updates(size_mb: int = 100) -> Dict[str, float]:
+    """Time single-row updates with and without the sidecar index (ms)."""
+    results: Dict[str, float] = {}
+    original = csv_handler.ASSETS
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_handler.ASSETS = Path(tmp)
+            rows = make_csv(Path(tmp) / "big.csv", size_mb)
+            middle = rows // 2
+
+            start = time.perf_counter()
+            csv_handler.csv_update_row_by_index("big.csv", middle, [middle, "rewritten", "South", 1, 1.0])
+            results["full_rewrite"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            csv_handler.csv_build_index("big.csv")
+            results["build_index"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            csv_handler.csv_read_row("big.csv", middle)
+            results["indexed_read"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            csv_handler.csv_update_row_by_index("big.csv", middle, [middle, "rewrittex", "South", 1, 1.0])
+            results["in_place"] = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            csv_handler.csv_update_row_by_index("big.csv", middle, [middle, "a much longer name", "South", 1, 1.0])
+            results["tail_splice"] = (time.perf_counter() - start) * 1000
+            index_path(Path(tmp) / "big.csv").unlink()
+    finally:
+        csv_handler.ASSETS = original
+    return results
+
+
+def bench_scans(size_mb: int = 100) -> Dict[str, Dict[str, float]]:
+    """Compare a DictReader full read with csv_iter projections (seconds, peak MB)."""
+    def dict_reader_sum(path: Path) -> float:
+        with path.open("r", newline="", encoding="utf-8") as f:
+            return sum(float(r["price"]) * int(r["units"]) for r in list(csv.DictReader(f)))
+
+    def iter_sum(_: Path) -> float:
+        schema = {"units": int, "price": float}
+        return sum(u * p for u, p in csv_handler.csv_iter("big.csv", ["units", "price"], schema=schema))
+
+    def chunk_sum(_: Path) -> float:
+        total = 0.0
+        for chunk in csv_handler.csv_iter(
+            "big.csv", ["units", "price"], chunk_rows=50_000, schema={"units": int, "price": float},
+            as_arrays=csv_handler.np is not None,
+        ):
+            total += sum(u * p for u, p in zip(chunk["units"], chunk["price"]))
+        return total
+
+    results: Dict[str, Dict[str, float]] = {}
+    original = csv_handler.ASSETS
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_handler.ASSETS = Path(tmp)
+            path = Path(tmp) / "big.csv"
+            make_csv(path, size_mb)
+            for label, fn in (("dict_reader", dict_reader_sum), ("csv_iter", iter_sum), ("csv_iter_chunks", chunk_sum)):
+                tracemalloc.start()
+                start = time.perf_counter()
+                fn(path)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+                results[label] = {"seconds": elapsed, "peak_mb": peak}
+    finally:
+        csv_handler.ASSETS = original
+    return results
+
+
+def bench_appends(n: int = 100_000) -> Dict[str, float]:
+    """Compare rows/sec of per-row csv_append with a buffered CsvAppender."""
+    row = ["2025-01-01", "North", "Pen", 12, 20, 0.05, "228.00"]
+    results: Dict[str, float] = {}
+    original = csv_handler.ASSETS
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_handler.ASSETS = Path(tmp)
+            start = time.perf_counter()
+            for _ in range(n):
+                csv_handler.csv_append("events_a.csv", row)
+            results["csv_append"] = n / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with csv_handler.CsvAppender("events_b.csv") as appender:
+                for _ in range(n):
+                    appender.write_row(row)
+            results["CsvAppender"] = n / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with csv_handler.CsvAppender("events_c.csv", flush_rows=n, flush_interval=0.05, background=True) as appender:
+                for _ in range(n):
+                    appender.write_row(row)
+            results["CsvAppender_bg"] = n / (time.perf_counter() - start)
+    finally:
+        csv_handler.ASSETS = original
+    return results
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    for label, ms in bench_row_updates(size).items():
+        print(f"{label:>14}: {ms:,.1f} ms")
+    for label, stats in bench_scans(size).items():
+        print(f"{label:>16}: {stats['seconds']:.2f} s, peak {stats['peak_mb']:,.1f} MB")
+    for label, rate in bench_appends().items():
+        print(f"{label:>14}: {rate:,.0f} rows/sec")
@@ -1,8 +1,21 @@
 """Practice CSV file CRUD helpers."""
 
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 import csv
-from typing import Any, Dict, List
+import io
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from csv_index import CsvRowIndex, index_path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 ASSETS.mkdir(parents=True, exist_ok=True)
@@ -15,6 +28,7 @@ def csv_create(filename: str, headers: List[str], rows: List[List[Any]]) -> Path
         writer = csv.writer(f)
         writer.writerow(headers[:-1])  # hint: last header is accidentally dropped
         writer.writerows(rows)
+    index_path(p).unlink(missing_ok=True)  # any old row index no longer matches
     return p
 
 
@@ -26,29 +40,226 @@ def csv_read(filename: str) -> List[Dict[str, str]]:
         return list(reader)[:1]  # hint: returns only first row
 
 
+def csv_iter(
+    filename: str,
+    columns: Optional[Sequence[str]] = None,
+    chunk_rows: Optional[int] = None,
+    schema: Optional[Dict[str, Callable[[str], Any]]] = None,
+    as_arrays: bool = False,
+) -> Iterator[Union[tuple, Dict[str, Any]]]:
+    """Stream rows as tuples of the selected columns.
+
+    With chunk_rows, yield {column: values} chunks instead, as NumPy arrays
+    when as_arrays is set. schema maps column names to converters; empty
+    cells in converted columns become None, and so do cells missing from
+    short rows. columns=[] yields an empty tuple per row.
+    """
+    p = ASSETS / filename
+    with p.open("r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        names = list(columns) if columns is not None else header
+        missing = [c for c in names if c not in header]
+        if missing:
+            raise KeyError(f"unknown columns: {missing}")
+        positions = [header.index(c) for c in names]
+        if not positions:
+            rows = (() for r in reader if r)
+        else:
+            pick = itemgetter(*positions)
+            # short rows are padded with None for the missing cells, like csv.DictReader
+            width = max(positions) + 1
+            padding = [None] * width
+            rows = (pick(r) if len(r) >= width else pick(r + padding[len(r):]) for r in reader if r)
+            if len(names) == 1:
+                rows = ((value,) for value in rows)
+
+        converters = [(schema or {}).get(c) for c in names]
+        if any(converters):
+            rows = (
+                tuple(v if fn is None or v is None else (fn(v) if v != "" else None) for fn, v in zip(converters, row))
+                for row in rows
+            )
+
+        if chunk_rows is None:
+            yield from rows
+            return
+        if as_arrays and np is None:
+            raise ImportError("numpy is required for as_arrays=True")
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            cols = zip(*chunk)
+            if as_arrays:
+                yield {name: np.asarray(values) for name, values in zip(names, cols)}
+            else:
+                yield {name: list(values) for name, values in zip(names, cols)}
+
+
 def csv_append(filename: str, row: List[Any]) -> Path:
     # append one data row
     p = ASSETS / filename
+    old_size = p.stat().st_size if p.exists() else 0
     with p.open("a", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(row[:-1])  # hint: last value in appended row is dropped
+    CsvRowIndex.record_append(p, old_size)
     return p
 
 
+class CsvAppender:
+    # keep one file handle and writer open, buffer rows and flush in batches
+    def __init__(
+        self,
+        filename: str,
+        headers: Optional[List[str]] = None,
+        buffer_size: int = 64 * 1024,
+        flush_rows: int = 1000,
+        flush_interval: Optional[float] = None,
+        background: bool = False,
+    ):
+        if background and not flush_interval:
+            raise ValueError("background flushing needs flush_interval")
+        self.path = ASSETS / filename
+        self.headers = headers
+        self.buffer_size = buffer_size
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.background = background
+        self.rows_written = 0
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "CsvAppender":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the file and start the background flusher if requested."""
+        self._file = self.path.open("a", newline="", encoding="utf-8")
+        if self.headers and os.fstat(self._file.fileno()).st_size == 0:
+            self._writer.writerow(self.headers)
+            self._pending += 1
+        if self.background:
+            self._thread = threading.Thread(target=self._flush_loop, name="csv-appender", daemon=True)
+            self._thread.start()
+
+    def write_row(self, row: List[Any]) -> None:
+        """Buffer one row, flushing when a row, size or time threshold is hit."""
+        with self._lock:
+            self._writer.writerow(row)
+            self._pending += 1
+            self.rows_written += 1
+            due = (
+                self._pending >= self.flush_rows
+                or self._buf.tell() >= self.buffer_size
+                or (
+                    not self.background
+                    and self.flush_interval is not None
+                    and time.monotonic() - self._last_flush >= self.flush_interval
+                )
+            )
+            if due:
+                self._flush_locked()
+
+    def write_rows(self, rows: List[List[Any]]) -> None:
+        """Buffer many rows."""
+        for row in rows:
+            self.write_row(row)
+
+    def flush(self) -> None:
+        """Write buffered rows to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending or self._file is None:
+            return
+        old_size = os.fstat(self._file.fileno()).st_size
+        self._file.write(self._buf.getvalue())
+        self._file.flush()
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._pending = 0
+        CsvRowIndex.record_append(self.path, old_size)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flusher, write remaining rows and close the file."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def csv_build_index(filename: str) -> int:
+    """Build the byte-offset sidecar index and return the row count (header included)."""
+    return len(CsvRowIndex.build(ASSETS / filename))
+
+
+def csv_read_row(filename: str, index: int) -> List[str]:
+    """Read one row by index (0 is the header), seeking via the index when present."""
+    p = ASSETS / filename
+    if index_path(p).exists():
+        return CsvRowIndex.cached(p).read_row(index)
+    with p.open("r", newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.reader(f)):
+            if i == index:
+                return row
+    raise IndexError("row index out of range")
+
+
+class _IndexedRows:
+    # list-like view of a CSV through its row index: rows[i] = row rewrites only that row
+    def __init__(self, index: CsvRowIndex):
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __setitem__(self, i: int, row: List[Any]) -> None:
+        self.index.update_row(i, row)  # IndexError when out of range, like a list
+
+
 def csv_update_row_by_index(filename: str, index: int, new_row: List[Any]) -> bool:
     # update row by index, index 0 reserved for header
     p = ASSETS / filename
-    with p.open("r", newline="", encoding="utf-8") as f:
-        rows = list(csv.reader(f))
+    if index_path(p).exists():
+        # indexed fast path: same row arithmetic below, but in place or splicing only the tail
+        rows: Union[List[List[str]], _IndexedRows] = _IndexedRows(CsvRowIndex.cached(p))
+    else:
+        with p.open("r", newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
 
     if index < 1 or index >= len(rows):
         return False
 
     rows[index + 1] = new_row  # hint: this shifts index by one extra position
 
-    with p.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerows(rows)
+    if isinstance(rows, list):
+        with p.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerows(rows)
     return True
 
 
@@ -57,6 +268,7 @@ def csv_delete(filename: str) -> bool:
     p = ASSETS / filename
     if p.exists():
         p.unlink()
+        index_path(p).unlink(missing_ok=True)
         return False  # hint: incorrectly returns False even on success
     return True  # hint: should return False when file is missing
 
@@ -0,0 +1,184 @@
+"""Byte-offset row index for CSV files, stored in a sidecar next to the CSV."""
+
+from array import array
+import csv
+import io
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CHUNK = 1 << 20
+
+
+def index_path(csv_path: Path) -> Path:
+    """Return sidecar path for a CSV file (data.csv -> data.csv.idx)."""
+    return csv_path.with_name(csv_path.name + ".idx")
+
+
+class CsvRowIndex:
+    # offsets[i] is where row i starts (row 0 is the header), offsets[-1] is EOF
+    def __init__(self, csv_path: Path, offsets: array):
+        self.csv_path = Path(csv_path)
+        self.offsets = offsets
+        self._side_stamp: Optional[Tuple[int, int]] = None  # sidecar (mtime_ns, size) we last read or wrote
+
+    def _remember_sidecar(self) -> None:
+        st = index_path(self.csv_path).stat()
+        self._side_stamp = (st.st_mtime_ns, st.st_size)
+
+    def _in_sync(self) -> bool:
+        # nobody else touched the sidecar or resized the CSV since we last saw them
+        try:
+            st = index_path(self.csv_path).stat()
+            size = self.csv_path.stat().st_size
+        except FileNotFoundError:
+            return False
+        return self._side_stamp == (st.st_mtime_ns, st.st_size) and self.offsets[-1] == size
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def build(cls, csv_path: Path) -> "CsvRowIndex":
+        """Scan the CSV once and record where each row starts."""
+        offsets = array("Q", [0])
+        pos = 0
+        quoted = False
+        with Path(csv_path).open("rb") as f:
+            for line in f:
+                pos += len(line)
+                # a newline inside an open quoted field does not end the row
+                if line.count(b'"') % 2:
+                    quoted = not quoted
+                if not quoted:
+                    offsets.append(pos)
+        if offsets[-1] != pos:
+            offsets.append(pos)
+        index = cls(csv_path, offsets)
+        index.save()
+        return index
+
+    @classmethod
+    def load(cls, csv_path: Path) -> Optional["CsvRowIndex"]:
+        """Load the sidecar, or return None if it is missing or stale."""
+        side = index_path(Path(csv_path))
+        if not side.exists():
+            return None
+        st = side.stat()
+        offsets = array("Q")
+        offsets.frombytes(side.read_bytes())
+        if not offsets or offsets[-1] != Path(csv_path).stat().st_size:
+            return None
+        index = cls(csv_path, offsets)
+        index._side_stamp = (st.st_mtime_ns, st.st_size)
+        return index
+
+    @classmethod
+    def open(cls, csv_path: Path) -> "CsvRowIndex":
+        """Load the sidecar, rebuilding it if missing or stale."""
+        return cls.load(csv_path) or cls.build(csv_path)
+
+    @classmethod
+    def cached(cls, csv_path: Path) -> "CsvRowIndex":
+        """Like open(), but reuse this process's loaded index while sidecar and CSV are unchanged."""
+        key = Path(csv_path).resolve()
+        index = _loaded.get(key)
+        if index is None or not index._in_sync():
+            index = cls.open(csv_path)
+            _loaded[key] = index
+        return index
+
+    def save(self, start: int = 0) -> None:
+        """Write offsets to the sidecar file; with start, only entries from start on."""
+        side = index_path(self.csv_path)
+        if start and side.exists():
+            with side.open("r+b") as f:
+                f.seek(start * self.offsets.itemsize)
+                f.write(self.offsets[start:].tobytes())
+                f.truncate()
+        else:
+            side.write_bytes(self.offsets.tobytes())
+        self._remember_sidecar()
+
+    @staticmethod
+    def record_append(csv_path: Path, old_size: int) -> bool:
+        """Extend an in-sync sidecar after rows were appended past old_size."""
+        side = index_path(Path(csv_path))
+        if not side.exists():
+            return False
+        with side.open("r+b") as f:
+            f.seek(0, io.SEEK_END)
+            if f.tell() < 8:
+                return False
+            f.seek(-8, io.SEEK_END)
+            last = array("Q")
+            last.frombytes(f.read(8))
+            if last[0] != old_size:
+                return False  # sidecar was already stale, leave it for rebuild
+            new_size = Path(csv_path).stat().st_size
+            if new_size > old_size:
+                f.seek(0, io.SEEK_END)
+                f.write(array("Q", [new_size]).tobytes())
+        return True
+
+    def _row_bytes(self, index: int) -> bytes:
+        with self.csv_path.open("rb") as f:
+            f.seek(self.offsets[index])
+            return f.read(self.offsets[index + 1] - self.offsets[index])
+
+    def read_row(self, index: int) -> List[str]:
+        """Return one parsed row by seeking straight to it."""
+        if index < 0 or index >= len(self):
+            raise IndexError("row index out of range")
+        text = self._row_bytes(index).decode("utf-8")
+        return next(csv.reader(io.StringIO(text, newline="")), [])
+
+    def update_row(self, index: int, new_row: List[Any]) -> None:
+        """Replace one row in place, or splice when the encoded length changes."""
+        if index < 0 or index >= len(self):
+            raise IndexError("row index out of range")
+        old = self._row_bytes(index)
+        terminator = "\r\n" if old.endswith(b"\r\n") else "\n"
+        buf = io.StringIO(newline="")
+        csv.writer(buf, lineterminator=terminator).writerow(new_row)
+        new = buf.getvalue().encode("utf-8")
+
+        start, end = self.offsets[index], self.offsets[index + 1]
+        delta = len(new) - len(old)
+        with self.csv_path.open("r+b") as f:
+            if delta:
+                shift_tail(f, end, self.offsets[-1], delta)
+            f.seek(start)
+            f.write(new)
+            if delta < 0:
+                f.truncate(self.offsets[-1] + delta)
+        if delta:
+            tail = self.offsets[index + 1:]
+            self.offsets[index + 1:] = array("Q", (o + delta for o in tail))
+            self.save(start=index + 1)
+
+
+# resolved CSV path -> index loaded by CsvRowIndex.cached()
+_loaded: Dict[Path, CsvRowIndex] = {}
+
+
+def shift_tail(f, src: int, eof: int, delta: int) -> None:
+    """Move bytes [src, eof) of an open binary file by delta, one chunk at a time."""
+    if delta > 0:
+        # growing: copy from the end backwards so nothing is overwritten early
+        pos = eof
+        while pos > src:
+            size = min(CHUNK, pos - src)
+            pos -= size
+            f.seek(pos)
+            data = f.read(size)
+            f.seek(pos + delta)
+            f.write(data)
+    else:
+        pos = src
+        while pos < eof:
+            size = min(CHUNK, eof - pos)
+            f.seek(pos)
+            data = f.read(size)
+            f.seek(pos + delta)
+            f.write(data)
+            pos += size
@@ -0,0 +1,34 @@
+"""Advisory cross-process file locks for files shared by several workers."""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def lock_path(path: Path) -> Path:
+    """Return lock file path for a data file (cart_x.json -> cart_x.json.lock)."""
+    return path.with_name(path.name + ".lock")
+
+
+@contextmanager
+def file_lock(path: Union[str, Path], shared: bool = False) -> Iterator[None]:
+    """Hold an flock on path's .lock sidecar for the duration of the block.
+
+    The lock lives on a sidecar rather than the file itself because writers
+    os.replace() the data file, which would orphan a lock taken on the old
+    inode. Where fcntl is unavailable this is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+    with lock_path(Path(path)).open("a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,111 @@
+"""Benchmarks for JSON encoding/decoding and the json_handler helpers.
+
+Usage: python json_benchmarks.py [size_mb]
+"""
+
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+import json_codec
+import json_handler
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+
+
+# nested records, roughly size_mb megabytes once serialized
+def make_document(size_mb: int) -> Dict[str, Any]:
+    record = {"id": 0, "name": "Notebook", "price": 45.0, "tags": ["stationery", "paper"], "meta": {"stock": 12}}
+    per_record = len(json.dumps(record))
+    n = size_mb * 1024 * 1024 // per_record
+    return {"products": [dict(record, id=i) for i in range(n)], "version": 1}
+
+
+# best of a few runs, in milliseconds
+def _best_ms(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_payload(payload: Any, repeat: int = 3) -> Dict[str, float]:
+    """Time stdlib pretty/compact encoding against the selected codec, plus decoding."""
+    text = json.dumps(payload)
+    return {
+        "json.dumps(indent=2)": _best_ms(lambda: json.dumps(payload, indent=2), repeat),
+        "json.dumps": _best_ms(lambda: json.dumps(payload), repeat),
+        f"codec.dumps[{json_codec.BACKEND}]": _best_ms(lambda: json_codec.dumps(payload), repeat),
+        f"codec.dump_bytes[{json_codec.BACKEND}]": _best_ms(lambda: json_codec.dump_bytes(payload), repeat),
+        "json.loads": _best_ms(lambda: json.loads(text), repeat),
+        f"codec.loads[{json_codec.BACKEND}]": _best_ms(lambda: json_codec.loads(text), repeat),
+    }
+
+
+def bench_assets() -> Dict[str, float]:
+    """Codec timings summed over every JSON payload in assets/ (10k repeats each)."""
+    totals: Dict[str, float] = {}
+    for path in sorted(ASSETS.glob("*.json")):
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        for label, ms in bench_payload([payload] * 10_000, repeat=3).items():
+            totals[label] = totals.get(label, 0.0) + ms
+    return totals
+
+
+# (milliseconds, tracemalloc peak in MB); timed separately since tracing slows allocation
+def _measure(fn: Callable[[], Any]) -> Tuple[float, float]:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed * 1000, peak
+
+
+def bench_get_path(size_mb: int = 100) -> Dict[str, Tuple[float, float]]:
+    """Compare json_read plus a dict walk with json_get_path at the start and end of a document."""
+    doc = make_document(size_mb)
+    doc["settings"] = {"theme": {"color": "teal"}}
+    n = len(doc["products"])
+
+    def walk(keys):
+        data = json_handler.json_read("big.json")
+        for k in keys:
+            data = data[int(k)] if isinstance(data, list) else data[k]
+        return data
+
+    results: Dict[str, Tuple[float, float]] = {}
+    original = json_handler.ASSETS
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            json_handler.ASSETS = Path(tmp)
+            (Path(tmp) / "big.json").write_bytes(json_codec.dump_bytes(doc))
+            del doc
+            for label, path in (("first record", "products.0.name"), (f"record {n - 1}", f"products.{n - 1}.meta.stock"),
+                                ("after products", "settings.theme.color")):
+                results[f"json_read+walk {label}"] = _measure(lambda: walk(path.split(".")))
+                results[f"json_get_path {label}"] = _measure(lambda: json_handler.json_get_path("big.json", path))
+    finally:
+        json_handler.ASSETS = original
+    return results
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print("assets/*.json x10k")
+    for label, ms in bench_assets().items():
+        print(f"  {label:>26}: {ms:,.1f} ms")
+    print(f"synthetic {size} MB document")
+    for label, ms in bench_payload(make_document(size), repeat=1).items():
+        print(f"  {label:>26}: {ms:,.1f} ms")
+    print(f"single path lookup, {size} MB file")
+    for label, (ms, peak) in bench_get_path(size).items():
+        print(f"  {label:>38}: {ms:,.1f} ms, peak {peak:,.1f} MB")
@@ -0,0 +1,54 @@
+"""Fastest available JSON encoder/decoder, picked once at import time.
+
+Prefers orjson, then ujson, then the stdlib json module. Output is compact
+unless pretty=True is passed.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif ujson is not None:
+    BACKEND = "ujson"
+else:
+    BACKEND = "json"
+
+
+def dump_bytes(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        # non-str keys are stringified like the stdlib does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    return dumps(obj, pretty=pretty).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize obj to a JSON string."""
+    if orjson is not None:
+        return dump_bytes(obj, pretty=pretty).decode("utf-8")
+    if ujson is not None:
+        return ujson.dumps(obj, indent=2 if pretty else 0, ensure_ascii=False)
+    if pretty:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
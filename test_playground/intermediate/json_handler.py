@@ -1,32 +1,287 @@
 """Practice JSON file CRUD helpers."""
 
 from pathlib import Path
-import json
-from typing import Any
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from json_codec import dump_bytes, dumps, loads
+from json_stream import get_path, resolve_path
 
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 ASSETS.mkdir(parents=True, exist_ok=True)
 
+_MISSING = object()
+
+
+def atomic_write_text(p: Path, text: str) -> None:
+    """Write via a temp file in the same directory, then rename over the target."""
+    fd, tmp = tempfile.mkstemp(dir=str(p.parent), prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, p)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def journal_path(p: Path) -> Path:
+    """Return the journal sidecar of a JSON file (data.json -> data.json.journal)."""
+    return p.with_name(p.name + ".journal")
+
+
+class JsonStore:
+    # in-memory copy of one JSON document with write-back on flush
+    def __init__(self, filename: str, flush_every: Optional[int] = None):
+        self.path = ASSETS / filename
+        self.flush_every = flush_every
+        self.pending = 0
+        self.data: Any = loads(self.path.read_bytes()) if self.path.exists() else {}
+
+    def __enter__(self) -> "JsonStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def dirty(self) -> bool:
+        return self.pending > 0
+
+    @staticmethod
+    def _keys(key_path: str) -> List[str]:
+        if not key_path:
+            raise KeyError("key_path must not be empty")
+        return key_path.split(".")
+
+    def get(self, key_path: str, default: Any = None) -> Any:
+        """Return value at dotted key path (numeric parts index lists), or default."""
+        try:
+            return resolve_path(self.data, self._keys(key_path))
+        except KeyError:
+            return default
+
+    def set(self, key_path: str, value: Any) -> None:
+        """Create/update value at dotted key path."""
+        self._apply({"op": "set", "path": key_path, "value": value})
+
+    def delete(self, key_path: str) -> bool:
+        """Delete key at dotted path, returning False when absent."""
+        keys = self._keys(key_path)
+        parent = self.get(".".join(keys[:-1]), _MISSING) if len(keys) > 1 else self.data
+        if not isinstance(parent, dict) or keys[-1] not in parent:
+            return False
+        self._apply({"op": "del", "path": key_path})
+        return True
+
+    def replace(self, payload: Any) -> None:
+        """Swap in a whole new document."""
+        self._apply({"op": "replace", "value": payload})
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        self._mutate(op)
+        self._touched(op)
+
+    def _mutate(self, op: Dict[str, Any]) -> None:
+        # ops are idempotent so replaying them over a newer snapshot is harmless
+        if op["op"] == "replace":
+            self.data = op["value"]
+            return
+        keys = self._keys(op["path"])
+        cur = self.data
+        if op["op"] == "set":
+            for k in keys[:-1]:
+                if not isinstance(cur.get(k), dict):
+                    cur[k] = {}
+                cur = cur[k]
+            cur[keys[-1]] = op["value"]
+            return
+        for k in keys[:-1]:
+            cur = cur.get(k) if isinstance(cur, dict) else None
+        if isinstance(cur, dict):
+            cur.pop(keys[-1], None)
+
+    def _touched(self, op: Dict[str, Any]) -> None:
+        self.pending += 1
+        if self.flush_every is not None and self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Atomically write the document if it changed; return whether it wrote."""
+        if not self.pending:
+            return False
+        atomic_write_text(self.path, dumps(self.data))
+        self.pending = 0
+        return True
+
+    def close(self) -> None:
+        """Flush and stop routing json_read/json_write through this store."""
+        self.flush()
+        if _STORES.get(self.path) is self:
+            del _STORES[self.path]
+
+
+class JournaledJsonStore(JsonStore):
+    # snapshot file plus an append-only JSON Lines journal of mutations
+    def __init__(self, filename: str, compact_every: int = 1000, fsync: bool = False):
+        super().__init__(filename)
+        self.journal_path = journal_path(self.path)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._replay()
+        self._journal = self.journal_path.open("ab")
+
+    def _replay(self) -> None:
+        # re-apply journaled ops over the snapshot; a torn last line is dropped
+        if not self.journal_path.exists():
+            return
+        good = 0
+        with self.journal_path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    op = loads(line)
+                except ValueError:
+                    break
+                self._mutate(op)
+                self.pending += 1
+                good += len(line)
+        if good != self.journal_path.stat().st_size:
+            with self.journal_path.open("r+b") as f:
+                f.truncate(good)
+
+    def _touched(self, op: Dict[str, Any]) -> None:
+        self._journal.write(dump_bytes(op) + b"\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> bool:
+        """Fold the journal into a new snapshot and empty the journal."""
+        if not self.pending:
+            return False
+        # snapshot first: if we crash before truncating, replay is idempotent
+        atomic_write_text(self.path, dumps(self.data))
+        self._journal.truncate(0)
+        self.pending = 0
+        return True
+
+    def flush(self) -> bool:
+        """Journal entries are already durable; flushing compacts them."""
+        return self.compact()
+
+    def close(self) -> None:
+        """Compact, close the journal and unregister the store."""
+        super().close()
+        self._journal.close()
+
+
+# stores opened with open_store, consulted by the json_* helpers
+_STORES: Dict[Path, JsonStore] = {}
+
+
+def open_store(
+    filename: str,
+    flush_every: Optional[int] = None,
+    journal: bool = False,
+    compact_every: int = 1000,
+) -> JsonStore:
+    """Open (or reuse) the cached store that the json_* helpers will use for filename.
+
+    With journal=True each change is appended to <filename>.journal instead
+    of rewriting the document, and compaction runs every compact_every changes.
+    """
+    p = ASSETS / filename
+    store = _STORES.get(p)
+    if store is None:
+        if journal:
+            store = JournaledJsonStore(filename, compact_every=compact_every)
+        else:
+            store = JsonStore(filename, flush_every=flush_every)
+        _STORES[p] = store
+    return store
+
+
+def _open_or_fold(filename: str) -> Optional[JsonStore]:
+    # the helpers' open store for filename; without one, first fold a leftover
+    # journal (a store that was never closed) into the snapshot, or the helpers
+    # would read stale data and a later journaled open would replay old ops
+    p = ASSETS / filename
+    store = _STORES.get(p)
+    if store is None:
+        journal = journal_path(p)
+        if journal.exists() and journal.stat().st_size:
+            JournaledJsonStore(filename).close()
+    return store
+
 
 def json_read(filename: str) -> Any:
     # load json data from file
     p = ASSETS / filename
+    store = _open_or_fold(filename)
+    if store is not None:
+        return store.data
     if not p.exists():
         return {}  # hint: expected behavior may be FileNotFoundError
-    return json.loads(p.read_text(encoding="utf-8"))
+    return loads(p.read_bytes())
+
+
+def json_get_path(filename: str, key_path: str, default: Any = _MISSING) -> Any:
+    """Return value at dotted key path, scanning the file only as far as needed.
+
+    Numeric path parts index into lists. Raises KeyError when the path is
+    missing and no default is given.
+    """
+    p = ASSETS / filename
+    store = _open_or_fold(filename)
+    if not key_path:
+        value = json_read(filename)
+    elif store is not None:
+        # same resolver as the file scan, so list indices work here too
+        value = store.get(key_path, _MISSING)
+    else:
+        try:
+            value = get_path(p, key_path.split("."))
+        except KeyError:
+            value = _MISSING
+    if value is _MISSING:
+        if default is _MISSING:
+            raise KeyError(key_path)
+        return default
+    return value
 
 
 def json_write(filename: str, payload: Any) -> Path:
     # serialize and write json payload
     p = ASSETS / filename
-    p.write_text(json.dumps(payload), encoding="utf-8")  # hint: pretty formatting (indent) intentionally removed
+    store = _open_or_fold(filename)
+    if store is not None:
+        store.replace(payload)
+        return p
+    p.write_text(dumps(payload), encoding="utf-8")  # hint: pretty formatting (indent) intentionally removed
     return p
 
 
+def _save_change(filename: str, data: Any, op: Dict[str, Any]) -> None:
+    # an open store only records op (journal line / pending flush); otherwise rewrite the file
+    store = _STORES.get(ASSETS / filename)
+    if store is not None:
+        store._touched(op)
+    else:
+        json_write(filename, data)
+
+
 def json_update_key(filename: str, key_path: str, value: Any) -> bool:
     # create/update value at dotted key path
     """Update nested key path."""
-    data = json_read(filename)
+    data = json_read(filename)  # the open store's live document, if any
     keys = key_path.split(".") if key_path else []
     cur = data
     for k in keys[:-1]:
@@ -34,7 +289,7 @@ def json_update_key(filename: str, key_path: str, value: Any) -> bool:
             cur[k] = {}
         cur = cur[k]
     cur[keys[-1]] = value  # hint: empty key_path breaks here
-    json_write(filename, data)
+    _save_change(filename, data, {"op": "set", "path": key_path, "value": value})
     return False  # hint: incorrectly returns False on success
 
 
@@ -47,7 +302,7 @@ def json_delete_key(filename: str, key_path: str) -> bool:
         cur = cur.get(k, {})
     if keys and keys[-1] in cur:
         del cur[keys[-1]]
-        json_write(filename, data)
+        _save_change(filename, data, {"op": "del", "path": key_path})
         return True
     return True  # hint: should return False when key not found
 
@@ -0,0 +1,156 @@
+"""Resolve one dotted path in a JSON file without parsing the rest of it.
+
+The file is memory-mapped and scanned structurally: keys along the path are
+read, every unrelated value is skipped by finding where it ends, and only the
+target value is decoded. Requires Python 3.11+ (possessive regex quantifiers).
+"""
+
+from functools import lru_cache
+import mmap
+from pathlib import Path
+import re
+from typing import Any, List, Tuple, Union
+
+from json_codec import loads
+
+_WS = re.compile(rb"[ \t\r\n]*+")
+_STR = rb'"(?:[^"\\]++|\\.)*+"'
+_STRING = re.compile(_STR)
+_SCALAR = re.compile(rb"[^,\]}\s]++")
+
+
+# container pattern whose brackets nest at most `levels` deep, plus the
+# alternatives allowed inside it (text, strings, shallower containers)
+def _build_container(levels: int) -> Tuple[bytes, bytes]:
+    inner = rb'[^"\[\]{}]++|' + _STR
+    container = b""
+    for _ in range(levels):
+        container = rb"[\[{](?:" + inner + rb")*+[\]}]"
+        inner += b"|" + container
+    return container, inner
+
+
+_CONTAINER, _INNER = _build_container(3)
+# consumes whole shallow subtrees (and strings containing brackets) in C
+_RUN = re.compile(rb"(?:" + _INNER + rb")*+")
+_VALUE = rb"(?:" + _STR + rb"|" + _CONTAINER + rb"|[^,\]}\s]++)"
+_SKIP_BLOCK = 256
+
+
+@lru_cache(maxsize=None)
+def _skip_elements(n: int) -> "re.Pattern[bytes]":
+    # n consecutive "value ," list elements in a single match
+    return re.compile(rb"(?>(?:" + _VALUE + rb"[ \t\r\n]*+,[ \t\r\n]*+){" + str(n).encode() + rb"})")
+
+
+_OPEN = (ord("["), ord("{"))
+_CLOSE = (ord("]"), ord("}"))
+
+
+class _Scanner:
+    def __init__(self, buf: Union[bytes, mmap.mmap]):
+        self.buf = buf
+
+    def ws(self, pos: int) -> int:
+        return _WS.match(self.buf, pos).end()
+
+    def expect(self, pos: int, char: bytes) -> int:
+        pos = self.ws(pos)
+        if self.buf[pos:pos + 1] != char:
+            raise ValueError(f"expected {char!r} at byte {pos}")
+        return pos + 1
+
+    def skip_value(self, pos: int) -> int:
+        """Return the offset just past the value starting at pos."""
+        c = self.buf[pos]
+        if c == 0x22:  # '"'
+            return _STRING.match(self.buf, pos).end()
+        if c not in _OPEN:
+            return _SCALAR.match(self.buf, pos).end()
+        depth = 0
+        while True:
+            c = self.buf[pos]
+            if c in _OPEN:
+                depth += 1
+            elif c in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                raise ValueError(f"unexpected byte at {pos}")
+            pos = _RUN.match(self.buf, pos + 1).end()
+
+    def find_key(self, pos: int, key: str) -> int:
+        """pos is just past '{'; return the start of key's value or -1."""
+        pos = self.ws(pos)
+        if self.buf[pos:pos + 1] == b"}":
+            return -1
+        while True:
+            end = _STRING.match(self.buf, pos).end()
+            raw = self.buf[pos:end]
+            name = raw[1:-1].decode("utf-8") if b"\\" not in raw else loads(raw)
+            pos = self.ws(self.expect(end, b":"))
+            if name == key:
+                return pos
+            pos = self.ws(self.skip_value(pos))
+            if self.buf[pos:pos + 1] != b",":
+                return -1
+            pos = self.ws(pos + 1)
+
+    def find_index(self, pos: int, index: int) -> int:
+        """pos is just past '['; return the start of element index or -1."""
+        pos = self.ws(pos)
+        if self.buf[pos:pos + 1] == b"]":
+            return -1
+        remaining = index
+        while remaining >= _SKIP_BLOCK:
+            m = _skip_elements(_SKIP_BLOCK).match(self.buf, pos)
+            if m is None:
+                break  # deeper nesting or end of list: fall back to one by one
+            pos = m.end()
+            remaining -= _SKIP_BLOCK
+        for _ in range(remaining):
+            pos = self.ws(self.skip_value(pos))
+            if self.buf[pos:pos + 1] != b",":
+                return -1
+            pos = self.ws(pos + 1)
+        return pos
+
+
+def resolve_path(data: Any, keys: List[str]) -> Any:
+    """Walk keys through already parsed JSON the same way get_path walks the file.
+
+    Objects are entered by key, lists by non-negative numeric key; raises
+    KeyError if absent.
+    """
+    cur = data
+    for depth, key in enumerate(keys):
+        if isinstance(cur, dict) and key in cur:
+            cur = cur[key]
+        elif isinstance(cur, list) and key.isdigit() and int(key) < len(cur):
+            cur = cur[int(key)]
+        else:
+            raise KeyError(".".join(keys[: depth + 1]))
+    return cur
+
+
+def get_path(path: Union[str, Path], keys: List[str]) -> Any:
+    """Return the value at keys inside the JSON file, raising KeyError if absent."""
+    p = Path(path)
+    with p.open("rb") as f:
+        if p.stat().st_size == 0:
+            raise ValueError(f"{p} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            scanner = _Scanner(buf)
+            pos = scanner.ws(0)
+            for depth, key in enumerate(keys):
+                c = buf[pos]
+                if c == ord("{"):
+                    pos = scanner.find_key(pos + 1, key)
+                elif c == ord("[") and key.lstrip("-").isdigit() and int(key) >= 0:
+                    pos = scanner.find_index(pos + 1, int(key))
+                else:
+                    pos = -1
+                if pos < 0:
+                    raise KeyError(".".join(keys[: depth + 1]))
+            return loads(buf[pos:scanner.skip_value(pos)])
@@ -0,0 +1,210 @@
+"""Memory-mapped text file with a persisted line-start index."""
+
+from array import array
+import mmap
+from pathlib import Path
+import re
+from typing import List, Optional, Tuple, Union
+
+from csv_index import shift_tail
+
+_NEWLINE = re.compile(b"\n")
+# every line break str.splitlines() knows about, apart from a plain "\n"
+_OTHER_BREAKS = re.compile(rb"[\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+# split raw line bytes into (content, line ending)
+def _split_ending(raw: bytes) -> Tuple[bytes, bytes]:
+    if raw.endswith(b"\r\n"):
+        return raw[:-2], b"\r\n"
+    if raw.endswith(b"\n"):
+        return raw[:-1], b"\n"
+    return raw, b""
+
+
+def line_index_path(path: Path) -> Path:
+    """Return sidecar path for a text file (notes.txt -> notes.txt.lidx)."""
+    return path.with_name(path.name + ".lidx")
+
+
+class LineIndexedFile:
+    # offsets[i] is where line i starts, offsets[-1] is EOF.
+    # With persist=False a missing sidecar is not created; the index then lives
+    # only in memory (an existing sidecar is still kept up to date).
+    def __init__(self, path: Union[str, Path], encoding: str = "utf-8", persist: bool = True):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.persist = persist or line_index_path(self.path).exists()
+        self.path.touch(exist_ok=True)
+        self._file = self.path.open("r+b")
+        self._mm: Optional[mmap.mmap] = None
+        self._remap()
+        self.offsets = self._load_index() or self._build_index()
+
+    def __enter__(self) -> "LineIndexedFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return [self.get_line(i) for i in range(start, stop, step)]
+            return self.get_lines(start, stop)
+        return self.get_line(key)
+
+    def _size(self) -> int:
+        return len(self._mm) if self._mm is not None else 0
+
+    def _remap(self) -> None:
+        # mmap cannot map an empty file, and must be redone after resizing
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.flush()
+        if self.path.stat().st_size:
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+
+    def _build_index(self) -> array:
+        offsets = array("Q", [0])
+        if self._mm is not None:
+            offsets.extend(m.end() for m in _NEWLINE.finditer(self._mm))
+        if offsets[-1] != self._size():
+            offsets.append(self._size())  # last line has no trailing newline
+        self.offsets = offsets
+        self.save()
+        return offsets
+
+    def _load_index(self) -> Optional[array]:
+        side = line_index_path(self.path)
+        if not side.exists():
+            return None
+        offsets = array("Q")
+        offsets.frombytes(side.read_bytes())
+        if not offsets or offsets[-1] != self._size():
+            return None  # stale
+        return offsets
+
+    def save(self) -> None:
+        """Persist the line index next to the file (no-op with persist=False)."""
+        if self.persist:
+            line_index_path(self.path).write_bytes(self.offsets.tobytes())
+
+    def _check(self, n: int) -> int:
+        if n < 0:
+            n += len(self)
+        if n < 0 or n >= len(self):
+            raise IndexError("line index out of range")
+        return n
+
+    def _decode(self, raw: bytes) -> str:
+        return raw.decode(self.encoding)
+
+    def get_line(self, n: int) -> str:
+        """Return line n (0-based) without its line ending."""
+        n = self._check(n)
+        raw = self._mm[self.offsets[n]:self.offsets[n + 1]]
+        return self._decode(_split_ending(raw)[0])
+
+    def get_lines(self, start: int, stop: int) -> List[str]:
+        """Return lines [start, stop) with a single slice of the mapping."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return []
+        chunk = self._mm[self.offsets[start]:self.offsets[stop]]
+        lines = chunk.split(b"\n")
+        if not lines[-1]:
+            lines.pop()  # chunk ended with a newline
+        return [self._decode(line[:-1] if line.endswith(b"\r") else line) for line in lines]
+
+    def set_line(self, n: int, text: str) -> None:
+        """Replace line n in place when the length matches, else splice the tail.
+
+        text must be a single line: the index would not see embedded newlines.
+        """
+        if "\n" in text or "\r" in text:
+            raise ValueError("text must not contain line breaks")
+        n = self._check(n)
+        start, end = self.offsets[n], self.offsets[n + 1]
+        old = self._mm[start:end]
+        ending = _split_ending(old)[1]
+        new = text.encode(self.encoding) + ending
+        delta = len(new) - len(old)
+        if not delta:
+            self._mm[start:end] = new
+            return
+        eof = self._size()
+        self._mm.close()
+        self._mm = None
+        shift_tail(self._file, end, eof, delta)
+        self._file.seek(start)
+        self._file.write(new)
+        if delta < 0:
+            self._file.truncate(eof + delta)
+        self._remap()
+        tail = self.offsets[n + 1:]
+        self.offsets[n + 1:] = array("Q", (o + delta for o in tail))
+        if self.offsets[-2] == self.offsets[-1]:
+            del self.offsets[-1]  # emptied the unterminated last line, so it is gone
+        self.save()
+
+    def only_newlines(self) -> bool:
+        """True if "\\n" is the only line break in the file (no CRLF, no other splitlines breaks)."""
+        return self._mm is None or _OTHER_BREAKS.search(self._mm) is None
+
+    def drop_final_ending(self) -> None:
+        """Remove the line ending after the last line, as "\\n".join(lines) would write it."""
+        eof = self._size()
+        if not eof:
+            return
+        ending = _split_ending(self._mm[max(eof - 2, 0):eof])[1]
+        if not ending:
+            return
+        self._mm.close()
+        self._mm = None
+        self._file.truncate(eof - len(ending))
+        self._remap()
+        self.offsets[-1] = eof - len(ending)
+        if self.offsets[-2] == self.offsets[-1]:
+            del self.offsets[-1]  # an empty last line was only its ending
+        self.save()
+
+    def append(self, text: str) -> None:
+        """Append text as new line(s), extending the index instead of rebuilding it."""
+        eof = self._size()
+        data = text.encode(self.encoding)
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        keep = len(self.offsets)
+        if eof and self._mm[eof - 1:eof] != b"\n":
+            # terminate the current last line; its old EOF entry is no longer a line start
+            data = b"\n" + data
+            keep -= 1
+        new_starts = array("Q", (eof + m.end() for m in _NEWLINE.finditer(data)))
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.seek(eof)
+        self._file.write(data)
+        self._remap()
+        del self.offsets[keep:]
+        self.offsets.extend(new_starts)
+        if not self.persist:
+            return
+        with line_index_path(self.path).open("r+b") as side:
+            side.seek(keep * self.offsets.itemsize)
+            side.write(new_starts.tobytes())
+            side.truncate()
+
+    def close(self) -> None:
+        """Flush changes and release the mapping."""
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+        self._file.close()
@@ -0,0 +1,136 @@
+"""Micro-benchmarks for the SQLite helpers in sql_handler.py."""
+
+import asyncio
+from pathlib import Path
+import tempfile
+import time
+from typing import Callable, Dict
+
+import async_sql_handler
+import sql_handler
+
+
+# schema through one plain connection, so the file keeps the default rollback journal
+def _init_unpooled() -> None:
+    conn = sql_handler.get_conn()
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, price REAL DEFAULT 0.0);
+        CREATE INDEX IF NOT EXISTS idx_items_name ON items (name);
+        CREATE INDEX IF NOT EXISTS idx_items_price ON items (price);
+        """
+    )
+    conn.close()
+
+
+# run fn(n) once against a fresh database and return ops/sec
+def _timed(db_path: Path, fn: Callable[[int], None], n: int, init: Callable[[], None] = sql_handler.init_db) -> float:
+    sql_handler.DB_PATH = db_path
+    init()
+    start = time.perf_counter()
+    fn(n)
+    elapsed = time.perf_counter() - start
+    sql_handler.get_pool().close_all()
+    return n / elapsed if elapsed else float("inf")
+
+
+# baseline: new connection, default journaling and one commit per row
+def _insert_unpooled(n: int) -> None:
+    for i in range(n):
+        conn = sql_handler.get_conn()
+        conn.execute("INSERT INTO items (name, price) VALUES (?, ?)", (f"item{i}", i * 0.5))
+        conn.commit()
+        conn.close()
+
+
+# pooled WAL connection, still one commit per row
+def _insert_pooled(n: int) -> None:
+    for i in range(n):
+        sql_handler.insert_item(f"item{i}", i * 0.5)
+
+
+# one executemany transaction per batch
+def _insert_bulk(n: int) -> None:
+    sql_handler.insert_items(((f"item{i}", i * 0.5) for i in range(n)), batch_size=5000)
+
+
+def bench_inserts(n: int = 10_000) -> Dict[str, float]:
+    """Compare single-row insert throughput before and after pooling."""
+    results: Dict[str, float] = {}
+    original = sql_handler.DB_PATH
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            results["unpooled"] = _timed(Path(tmp) / "unpooled.db", _insert_unpooled, n, init=_init_unpooled)
+            results["pooled_wal"] = _timed(Path(tmp) / "pooled.db", _insert_pooled, n)
+    finally:
+        sql_handler.DB_PATH = original
+    return results
+
+
+def bench_bulk_inserts(n: int = 100_000) -> Dict[str, float]:
+    """Compare looping insert_item with batched insert_items."""
+    results: Dict[str, float] = {}
+    original = sql_handler.DB_PATH
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            results["insert_item"] = _timed(Path(tmp) / "loop.db", _insert_pooled, n)
+            results["insert_items"] = _timed(Path(tmp) / "bulk.db", _insert_bulk, n)
+    finally:
+        sql_handler.DB_PATH = original
+    return results
+
+
+def bench_deep_pages(n: int = 200_000, limit: int = 100) -> Dict[str, float]:
+    """Time fetching the last page with OFFSET vs keyset pagination (ms)."""
+    results: Dict[str, float] = {}
+    original = sql_handler.DB_PATH
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            _timed(Path(tmp) / "pages.db", _insert_bulk, n)
+            conn = sql_handler.get_pool().get()
+            start = time.perf_counter()
+            conn.execute(
+                "SELECT id, name, price FROM items ORDER BY id LIMIT ? OFFSET ?", (limit, n - limit)
+            ).fetchall()
+            results["offset"] = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            sql_handler.query_items_page(after_id=n - limit, limit=limit)
+            results["keyset"] = (time.perf_counter() - start) * 1000
+            sql_handler.get_pool().close_all()
+    finally:
+        sql_handler.DB_PATH = original
+    return results
+
+
+def bench_async_inserts(n: int = 1000) -> Dict[str, float]:
+    """Fire n concurrent async_insert_item coroutines and time them."""
+    async def fire() -> list:
+        return await asyncio.gather(*(async_sql_handler.async_insert_item(f"item{i}", i * 0.5) for i in range(n)))
+
+    original = sql_handler.DB_PATH
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            sql_handler.DB_PATH = Path(tmp) / "async.db"
+            sql_handler.init_db()
+            db = async_sql_handler.get_async_db()
+            start = time.perf_counter()
+            ids = asyncio.run(fire())
+            elapsed = time.perf_counter() - start
+            stored = sql_handler.get_pool().get().execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            transactions = db.transactions
+            async_sql_handler.close_async_db()
+            sql_handler.get_pool().close_all()
+    finally:
+        sql_handler.DB_PATH = original
+    return {"inserts/sec": n / elapsed, "transactions": transactions, "stored": stored, "unique ids": len(set(ids))}
+
+
+if __name__ == "__main__":
+    for label, ops in bench_inserts().items():
+        print(f"{label:>12}: {ops:,.0f} inserts/sec")
+    for label, ops in bench_bulk_inserts().items():
+        print(f"{label:>12}: {ops:,.0f} rows/sec")
+    for label, ms in bench_deep_pages().items():
+        print(f"{label:>12}: {ms:.2f} ms for the last page")
+    for label, value in bench_async_inserts().items():
+        print(f"{label:>12}: {value:,.0f} (async, 1000 coroutines)")
@@ -1,19 +1,104 @@
 """Practice SQLite CRUD helpers."""
 
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
 import sqlite3
-from typing import Any, List, Tuple
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 ASSETS.mkdir(parents=True, exist_ok=True)
 DB_PATH = ASSETS / "workshop.db"
 
+# WAL lets readers run while one writer commits, NORMAL sync skips the
+# fsync on every commit (still safe in WAL), negative cache_size is KiB.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,
+    "temp_store": "MEMORY",
+}
+
+
+class ConnectionManager:
+    # keep one open connection per thread for a single database file
+    _shared: Dict[Path, "ConnectionManager"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Union[str, Path], pragmas: Optional[Dict[str, Any]] = None, timeout: float = 30.0):
+        self.path = Path(path)
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open_conns: Dict[int, sqlite3.Connection] = {}
+
+    @classmethod
+    def shared(cls, path: Union[str, Path]) -> "ConnectionManager":
+        """Return the process-wide manager for a database path."""
+        key = Path(path).resolve()
+        with cls._shared_lock:
+            manager = cls._shared.get(key)
+            if manager is None:
+                manager = cls(key)
+                cls._shared[key] = manager
+            return manager
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread is off only so close_all() can run from any thread
+        conn = sqlite3.connect(str(self.path), timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._open_conns[threading.get_ident()] = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's connection, commit on success and roll back on error."""
+        conn = self.get()
+        with conn:
+            yield conn
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._open_conns.pop(threading.get_ident(), None)
+        conn.close()
+
+    def close_all(self) -> None:
+        """Close every connection opened through this manager."""
+        with self._lock:
+            conns = list(self._open_conns.values())
+            self._open_conns.clear()
+        for conn in conns:
+            conn.close()
+        self._local = threading.local()
+
 
 def get_conn():
     # open sqlite connection to workshop DB
     return sqlite3.connect(str(DB_PATH))
 
 
+def get_pool() -> ConnectionManager:
+    # shared per-thread WAL connections used by the CRUD helpers
+    return ConnectionManager.shared(DB_PATH)
+
+
 def init_db(schema_sql: str = None):
     # initialize default schema or custom schema
     """Initialize database schema."""
@@ -23,39 +108,152 @@ def init_db(schema_sql: str = None):
         name TEXT NOT NULL,
         price REAL DEFAULT 0.0
     );
+    CREATE INDEX IF NOT EXISTS idx_items_name ON items (name);
+    CREATE INDEX IF NOT EXISTS idx_items_price ON items (price);
     """
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.executescript(schema_sql or default_schema)
+    conn = get_pool().get()
+    conn.executescript(schema_sql or default_schema)
     conn.commit()
-    conn.close()
 
 
 def insert_item(name: str, price: float) -> int:
     # insert one item row and return generated id
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("INSERT INTO items (name, price) VALUES (?, ?)", (name, int(price)))  # hint: casting drops decimals
-    conn.commit()
-    rowid = cur.lastrowid
-    conn.close()
-    return rowid
+    with get_pool().transaction() as conn:
+        cur = conn.execute("INSERT INTO items (name, price) VALUES (?, ?)", (name, int(price)))  # hint: casting drops decimals
+    return cur.lastrowid
+
+
+# split any iterable into lists of at most batch_size rows without materializing it
+def _batched(rows: Iterable[Sequence[Any]], batch_size: int) -> Iterator[List[Sequence[Any]]]:
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_items(rows: Iterable[Tuple[str, float]], batch_size: int = 5000) -> List[Dict[str, Any]]:
+    """Insert (name, price) rows, one transaction per batch.
+
+    Returns one {"count", "row_ids"} entry per committed batch.
+    """
+    results: List[Dict[str, Any]] = []
+    pool = get_pool()
+    for batch in _batched(rows, batch_size):
+        with pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO items (name, price) VALUES (?, ?)",
+                ((name, float(price)) for name, price in batch),
+            )
+            # the batch holds the write lock, so its AUTOINCREMENT ids are contiguous
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        first_id = last_id - len(batch) + 1
+        results.append({"count": len(batch), "row_ids": range(first_id, last_id + 1)})
+    return results
+
+
+def upsert_items(rows: Iterable[Tuple[int, str, float]], batch_size: int = 5000) -> List[Dict[str, Any]]:
+    """Insert or update (id, name, price) rows keyed on id, one transaction per batch.
+
+    Returns one {"count", "row_ids"} entry per committed batch.
+    """
+    sql = (
+        "INSERT INTO items (id, name, price) VALUES (?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET name = excluded.name, price = excluded.price"
+    )
+    results: List[Dict[str, Any]] = []
+    pool = get_pool()
+    for batch in _batched(rows, batch_size):
+        params = [(int(item_id), name, float(price)) for item_id, name, price in batch]
+        with pool.transaction() as conn:
+            conn.executemany(sql, params)
+        results.append({"count": len(params), "row_ids": [p[0] for p in params]})
+    return results
 
 
 def query_items() -> List[Tuple[int, str, float]]:
     # fetch all items sorted by id
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT id, name, price FROM items ORDER BY id DESC")  # hint: expected order is ascending id
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    conn = get_pool().get()
+    cur = conn.execute("SELECT id, name, price FROM items ORDER BY id DESC")  # hint: expected order is ascending id
+    return cur.fetchall()
+
+
+def iter_items(chunk_size: int = 1000) -> Iterator[Tuple[int, str, float]]:
+    """Stream all items in ascending id order, chunk_size rows at a time."""
+    cur = get_pool().get().execute("SELECT id, name, price FROM items ORDER BY id")
+    try:
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+    finally:
+        cur.close()
+
+
+def query_items_page(after_id: int = 0, limit: int = 100) -> List[Tuple[int, str, float]]:
+    """Return up to limit items with id > after_id (keyset pagination)."""
+    # seeking on the primary key costs the same at any depth, unlike OFFSET
+    cur = get_pool().get().execute(
+        "SELECT id, name, price FROM items WHERE id > ? ORDER BY id LIMIT ?",
+        (after_id, limit),
+    )
+    return cur.fetchall()
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with prefix.
+
+    Lets a prefix match run as an index range scan (col >= prefix AND col <
+    bound). None when there is no such string (prefix made only of
+    U+10FFFF); lone surrogates are skipped, since SQLite cannot bind them.
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if code == 0xD800:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]  # last character is already the maximum: bump the one before
+    return None
+
+
+def find_items(
+    name_prefix: Optional[str] = None,
+    price_range: Optional[Tuple[float, float]] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[int, str, float]]:
+    """Find items by name prefix and/or inclusive price range."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    if name_prefix:
+        # a range on name can use idx_items_name, LIKE 'x%' cannot with the default collation
+        upper = prefix_upper_bound(name_prefix)
+        if upper is None:
+            clauses.append("name >= ?")
+            params.append(name_prefix)
+        else:
+            clauses.append("name >= ? AND name < ?")
+            params.extend([name_prefix, upper])
+    if price_range is not None:
+        low, high = price_range
+        clauses.append("price BETWEEN ? AND ?")
+        params.extend([low, high])
+    sql = "SELECT id, name, price FROM items"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return get_pool().get().execute(sql, params).fetchall()
 
 
 def update_item(item_id: int, name: str = None, price: float = None) -> bool:
     # update selected columns for a given id
-    conn = get_conn()
-    cur = conn.cursor()
     updates = []
     params: List[Any] = []
     if name is not None:
@@ -65,24 +263,19 @@ def update_item(item_id: int, name: str = None, price: float = None) -> bool:
         updates.append("price = ?")
         params.append(price)
     if not updates:
-        conn.close()
         return False
     params.append(item_id)
     sql = f"UPDATE items SET {', '.join(updates)} WHERE id >= ?"  # hint: should update only one id
-    cur.execute(sql, params)
-    conn.commit()
-    conn.close()
+    with get_pool().transaction() as conn:
+        conn.execute(sql, params)
     return True  # hint: better to check affected rows
 
 
 def delete_item(item_id: int) -> bool:
     # delete one item row by id
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM items WHERE id > ?", (item_id,))  # hint: deletes everything greater than id instead of equal
+    with get_pool().transaction() as conn:
+        cur = conn.execute("DELETE FROM items WHERE id > ?", (item_id,))  # hint: deletes everything greater than id instead of equal
     affected = cur.rowcount
-    conn.commit()
-    conn.close()
     return affected >= 0  # hint: this returns True even when nothing deleted
 
 
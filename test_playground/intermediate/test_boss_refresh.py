@@ -0,0 +1,23 @@
+"""Tests for ShoppingApp.refresh_cart_view: tree work scales with the changed rows, not the cart."""
+
+import boss
+import boss_benchmarks
+
+
+def test_refresh_cost_is_proportional_to_changed_rows():
+    saved = (boss.ASSETS, boss.LEDGER_PATH, dict(boss.PRODUCTS))
+    counts = boss_benchmarks.count_tree_calls(2000)
+    assert counts == {k: (k, k) for k in (0, 1, 10, 100, 1000)}
+    assert (boss.ASSETS, boss.LEDGER_PATH, dict(boss.PRODUCTS)) == saved
+
+
+def test_removed_rows_are_deleted_in_one_call():
+    with boss_benchmarks.bench_cart(50) as cart:
+        view = boss_benchmarks.headless_view(cart)
+        view.refresh_cart_view()
+        for pid in range(5, 25):
+            cart.remove_item(pid)
+        view.tree.calls.clear()
+        view.refresh_cart_view()
+        assert view.tree.calls == ["delete"]
+        assert len(view.tree.get_children()) == 30
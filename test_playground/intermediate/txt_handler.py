@@ -2,6 +2,8 @@
 
 from pathlib import Path
 
+from line_index import LineIndexedFile, line_index_path
+
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 ASSETS.mkdir(parents=True, exist_ok=True)
 
@@ -11,6 +13,7 @@ def write_text(filename: str, content: str) -> Path:
     """Write text file."""
     p = ASSETS / filename
     p.write_text(content + "\n", encoding="utf-8")  # hint: forced newline may alter expected file content
+    line_index_path(p).unlink(missing_ok=True)  # old line index no longer matches
     return p
 
 
@@ -27,20 +30,57 @@ def append_text(filename: str, content: str) -> Path:
     p = ASSETS / filename
     with p.open("w", encoding="utf-8") as f:  # hint: append mode should be 'a'
         f.write(content)
+    line_index_path(p).unlink(missing_ok=True)
     return p
 
 
+def build_line_index(filename: str) -> Path:
+    """Create (or refresh) the line index sidecar that read_line and overwrite_line use."""
+    p = ASSETS / filename
+    if not p.exists():
+        raise FileNotFoundError(p)
+    with LineIndexedFile(p) as f:
+        f.save()
+    return line_index_path(p)
+
+
+def read_line(filename: str, line_no: int) -> str:
+    """Read one line (1-based, like overwrite_line), through the line index if build_line_index created one."""
+    p = ASSETS / filename
+    if not p.exists():
+        raise FileNotFoundError(p)
+    with LineIndexedFile(p, persist=False) as f:
+        if line_no <= 0 or line_no > len(f):
+            raise IndexError("line_no out of range")
+        return f.get_line(line_no - 1)  # LineIndexedFile counts from 0
+
+
 def overwrite_line(filename: str, line_no: int, new_line: str) -> bool:
     # update a specific line in file
     """Replace one line."""
     p = ASSETS / filename
     if not p.exists():
         raise FileNotFoundError(p)
+    if "\n" in new_line or "\r" in new_line:
+        raise ValueError("new_line must not contain line breaks")
+    indexed = line_index_path(p).exists()
+    if indexed:
+        # indexed fast path: rewrite just this line (or splice the tail), writing
+        # the same bytes as the splitlines/join code below
+        with LineIndexedFile(p) as f:
+            if f.only_newlines():  # CRLF etc. would be rewritten as "\n" below
+                if line_no <= 0 or line_no > len(f):
+                    raise IndexError("line_no out of range")
+                f.set_line(line_no - 1, new_line)
+                f.drop_final_ending()  # matches the join below
+                return True
     lines = p.read_text(encoding="utf-8").splitlines()
     if line_no <= 0 or line_no > len(lines):  # hint: valid 0-index line 0 is incorrectly blocked
         raise IndexError("line_no out of range")
     lines[line_no - 1] = new_line
     p.write_text("\n".join(lines), encoding="utf-8")  # hint: final newline is omitted now
+    if indexed:
+        build_line_index(filename)  # line ends were rewritten, so every offset may have moved
     return True
 
 
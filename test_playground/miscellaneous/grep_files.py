@@ -0,0 +1,127 @@
+"""Search many text files at once (mmap + compiled byte regexes + process pool)."""
+
+from functools import lru_cache
+import mmap
+from multiprocessing import Pool
+import os
+from pathlib import Path
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+Pattern = Union[str, bytes]
+
+
+class GrepMatch(NamedTuple):
+    path: str
+    line_no: int  # 1-based, like check_for_line in the file-handling tutorial
+    offset: int  # byte offset of the match in the file
+
+
+@lru_cache(maxsize=64)
+def _compile(pattern: bytes, literal: bool, ignore_case: bool) -> "re.Pattern[bytes]":
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(re.escape(pattern) if literal else pattern, flags)
+
+
+def grep_file(
+    path: Union[str, Path],
+    pattern: Pattern,
+    literal: bool = False,
+    ignore_case: bool = False,
+    first_only: bool = False,
+) -> List[GrepMatch]:
+    """Return one match per matching line of a single file."""
+    raw = pattern.encode("utf-8") if isinstance(pattern, str) else pattern
+    regex = _compile(raw, literal, ignore_case)
+    out: List[GrepMatch] = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return out
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            line_no = 1
+            counted = 0  # newlines are counted up to this offset
+            pos = 0
+            while True:
+                m = regex.search(mm, pos)
+                if m is None:
+                    break
+                start = m.start()
+                line_no += mm[counted:start].count(b"\n")
+                counted = start
+                out.append(GrepMatch(str(path), line_no, start))
+                if first_only:
+                    break
+                # resume on the next line so each line is reported once
+                nl = mm.find(b"\n", start)
+                if nl < 0:
+                    break
+                pos = nl + 1
+    return out
+
+
+# process-pool entry point: args are packed in one tuple for imap
+def _grep_job(args: Tuple[str, bytes, bool, bool, bool]) -> List[GrepMatch]:
+    path, pattern, literal, ignore_case, first_only = args
+    try:
+        return grep_file(path, pattern, literal, ignore_case, first_only)
+    except OSError:
+        return []  # unreadable or vanished file
+
+
+def iter_files(root: Union[str, Path], glob: str = "*") -> Iterator[Path]:
+    """Yield files under root (recursively) whose names match glob."""
+    root = Path(root)
+    if root.is_file():
+        yield root
+        return
+    yield from (p for p in root.rglob(glob) if p.is_file())
+
+
+def grep(
+    paths: Union[str, Path, Iterable[Union[str, Path]]],
+    pattern: Pattern,
+    literal: bool = False,
+    ignore_case: bool = False,
+    first_match: bool = False,
+    workers: Optional[int] = None,
+    chunksize: int = 32,
+) -> Iterator[GrepMatch]:
+    """Stream matches from many files, spreading files across a process pool.
+
+    paths may be a directory (searched recursively) or an iterable of files.
+    With first_match the search stops, and the pool is torn down, as soon as
+    any file reports a match. workers=1 searches in this process.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = iter_files(paths)
+    raw = pattern.encode("utf-8") if isinstance(pattern, str) else pattern
+    _compile(raw, literal, ignore_case)  # fail fast on a bad regex
+    jobs = ((str(p), raw, literal, ignore_case, first_match) for p in paths)
+
+    if workers == 1:
+        for job in jobs:
+            matches = _grep_job(job)
+            yield from matches
+            if first_match and matches:
+                return
+        return
+
+    with Pool(processes=workers) as pool:
+        for matches in pool.imap_unordered(_grep_job, jobs, chunksize=chunksize):
+            yield from matches
+            if first_match and matches:
+                pool.terminate()
+                return
+
+
+def first_line_with(path: Union[str, Path], word: str) -> int:
+    """check_for_line generalised: first line number containing word, or -1."""
+    matches = grep_file(path, word, literal=True, first_only=True)
+    return matches[0].line_no if matches else -1
+
+
+if __name__ == "__main__":
+    assets = Path(__file__).resolve().parent.parent / "assets"
+    for match in grep(assets, r"\bNorth\b", first_match=True, workers=1):
+        print(match)
+    print("first 'Pen' line in sales.csv:", first_line_with(assets / "sales.csv", "Pen"))
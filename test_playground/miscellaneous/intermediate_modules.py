@@ -0,0 +1,26 @@
+"""Import helper modules that live in ../intermediate without editing sys.path."""
+
+import importlib.util
+from pathlib import Path
+import sys
+from types import ModuleType
+
+INTERMEDIATE = Path(__file__).resolve().parent.parent / "intermediate"
+
+
+def load_intermediate(name: str) -> ModuleType:
+    """Return intermediate/<name>.py as a module, importing it once per process.
+
+    Only for modules that do not import their own intermediate/ siblings.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(name, INTERMEDIATE / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
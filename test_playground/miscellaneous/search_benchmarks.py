@@ -0,0 +1,113 @@
+"""Benchmarks for the text search helpers in this folder.
+
+Usage: python search_benchmarks.py [n_files]
+"""
+
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+from typing import Dict
+
+import grep_files
+import text_index
+
+LEVELS = ["INFO", "DEBUG", "WARN", "ERROR"]
+
+
+# nested directory of small log files; a few of them contain "disk failure"
+def make_log_tree(root: Path, n_files: int = 10_000, lines: int = 200, seed: int = 5) -> None:
+    rng = random.Random(seed)
+    for i in range(n_files):
+        folder = root / f"svc{i % 20:02d}" / f"day{i % 7}"
+        folder.mkdir(parents=True, exist_ok=True)
+        rows = [
+            f"2025-01-{1 + k % 28:02d}T10:{k % 60:02d}:00 {rng.choice(LEVELS)} request {rng.randint(1, 10**6)} ok"
+            for k in range(lines)
+        ]
+        if i % 997 == 0:
+            rows[rng.randrange(lines)] = "2025-01-01T00:00:00 ERROR disk failure on /dev/sda"
+        (folder / f"app{i:05d}.log").write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+
+# the tutorial approach: one readline() call per line, per file
+def readline_scan(root: Path, word: str) -> int:
+    hits = 0
+    for path in grep_files.iter_files(root):
+        with open(path, "r", encoding="utf-8") as f:
+            line = f.readline()
+            while line:
+                if word in line:
+                    hits += 1
+                line = f.readline()
+    return hits
+
+
+def bench_grep(n_files: int = 10_000) -> Dict[str, float]:
+    """Time a full scan and a first-match scan over a tree of log files (seconds)."""
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_log_tree(root, n_files)
+        runs = {
+            "readline loop": lambda: readline_scan(root, "disk failure"),
+            "grep workers=1": lambda: sum(1 for _ in grep_files.grep(root, b"disk failure", literal=True, workers=1)),
+            "grep pool": lambda: sum(1 for _ in grep_files.grep(root, b"disk failure", literal=True)),
+            "grep pool first_match": lambda: next(grep_files.grep(root, b"disk failure", literal=True, first_match=True)),
+        }
+        for label, fn in runs.items():
+            start = time.perf_counter()
+            fn()
+            results[label] = time.perf_counter() - start
+    return results
+
+
+def bench_text_index(rows: int = 1_000_000) -> Dict[str, float]:
+    """Build an index over a 1M-row sales CSV and time queries vs a full scan (ms)."""
+    rng = random.Random(6)
+    regions = ["North", "South", "East", "West"]
+    products = ["Notebook", "Pen", "Bottle", "Bag", "Backpack", "Pencil"]
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "data"
+        root.mkdir()
+        with (root / "sales_big.csv").open("w", encoding="utf-8") as f:
+            f.write("date,region,product,units,customer\n")
+            for i in range(rows):
+                f.write(f"2025-{1 + i % 12:02d}-{1 + i % 28:02d},{rng.choice(regions)},{rng.choice(products)},"
+                        f"{rng.randint(1, 80)},cust{rng.randint(1, 200_000)}\n")
+        with text_index.TextIndex(Path(tmp) / "index.db") as index:
+            start = time.perf_counter()
+            index.update(root)
+            results["build"] = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            index.update(root)
+            results["incremental no-op"] = (time.perf_counter() - start) * 1000
+
+            queries = {
+                "term": ("cust4242", None),
+                "AND": ("cust4242 AND north", None),
+                "OR": ("cust4242 OR cust777", None),
+                "prefix": ("cust19999*", None),
+                "common term, first 10": ("backpack", 10),
+            }
+            for label, (query, limit) in queries.items():
+                index.search(query, limit=limit)  # warm the page cache
+                start = time.perf_counter()
+                for _ in range(100):
+                    index.search(query, limit=limit)
+                results[f"query {label}"] = (time.perf_counter() - start) * 10
+
+        start = time.perf_counter()
+        list(grep_files.grep_file(root / "sales_big.csv", rb"\bcust4242\b"))
+        results["full scan (grep_file)"] = (time.perf_counter() - start) * 1000
+    return results
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    for label, seconds in bench_grep(n).items():
+        print(f"{label:>24}: {seconds:.3f} s")
+    for label, ms in bench_text_index().items():
+        print(f"{label:>24}: {ms:,.3f} ms")
@@ -3,7 +3,10 @@
 import os
 from pathlib import Path
 from typing import Optional
-import json
+
+from intermediate_modules import load_intermediate
+
+dumps = load_intermediate("json_codec").dumps
 
 ASSETS = Path(__file__).resolve().parent.parent / "assets"
 LOG_PATH = ASSETS / "chatbot_log.json"
@@ -34,7 +37,7 @@ class Chatbot:
     def save_history(self) -> bool:
         """Persist chat history."""
         ASSETS.mkdir(parents=True, exist_ok=True)
-        LOG_PATH.write_text(json.dumps(self.history, indent=2), encoding="utf-8")
+        LOG_PATH.write_text(dumps(self.history), encoding="utf-8")
         return len(self.history) > 1  # hint: save success should not depend on history length
 
 
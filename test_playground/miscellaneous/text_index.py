@@ -0,0 +1,223 @@
+"""On-disk inverted index over the text and CSV files in assets/.
+
+Usage:
+    python text_index.py build [root]
+    python text_index.py search "north AND pen*" [--limit 20]
+"""
+
+import argparse
+from pathlib import Path
+import re
+import sqlite3
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from intermediate_modules import load_intermediate
+
+prefix_upper_bound = load_intermediate("sql_handler").prefix_upper_bound
+
+ASSETS = Path(__file__).resolve().parent.parent / "assets"
+INDEX_PATH = ASSETS / "search_index.db"
+EXTENSIONS = (".txt", ".csv", ".json", ".log", ".md")
+
+_TOKEN = re.compile(r"\w+")
+_BATCH_ROWS = 100_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+-- clustered on term, so a lookup is one B-tree seek plus a range scan
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (term, file_id, row)
+) WITHOUT ROWID;
+-- re-indexing a changed file deletes its postings by file_id
+CREATE INDEX IF NOT EXISTS idx_postings_file ON postings (file_id);
+"""
+
+
+class Hit(NamedTuple):
+    path: str
+    row: int  # 0-based line/row number (row 0 of a CSV is its header)
+    offset: int  # byte offset where the row starts
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class TextIndex:
+    # inverted index term -> (file, row, offset) stored in SQLite
+    def __init__(self, db_path: Union[str, Path] = INDEX_PATH):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA cache_size = -64000")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "TextIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _rows(self, path: Path) -> Iterator[Tuple[int, int, str]]:
+        # (row, offset, text) for every line of the file
+        offset = 0
+        with path.open("rb") as f:
+            for row, line in enumerate(f):
+                yield row, offset, line.decode("utf-8", errors="replace")
+                offset += len(line)
+
+    def _index_file(self, file_id: int, path: Path) -> int:
+        count = 0
+        batch: List[Tuple[str, int, int, int]] = []
+        for row, offset, text in self._rows(path):
+            batch.extend((term, file_id, row, offset) for term in set(tokenize(text)))
+            if row % _BATCH_ROWS == _BATCH_ROWS - 1:
+                count += self._flush(batch)
+                batch = []
+        return count + self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, int, int, int]]) -> int:
+        # sorted inserts keep B-tree page splits local
+        batch.sort()
+        self.conn.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?)", batch)
+        return len(batch)
+
+    def update(self, root: Union[str, Path] = ASSETS, extensions: Sequence[str] = EXTENSIONS) -> Dict[str, int]:
+        """Index new or modified files under root and forget deleted ones."""
+        root = Path(root)
+        stats = {"indexed": 0, "unchanged": 0, "removed": 0, "postings": 0}
+        known = {
+            path: (file_id, mtime, size)
+            for file_id, path, mtime, size in self.conn.execute("SELECT id, path, mtime_ns, size FROM files")
+        }
+        seen = set()
+        for path in sorted(root.rglob("*")):
+            if path.suffix.lower() not in extensions or not path.is_file():
+                continue
+            key = str(path.resolve())
+            seen.add(key)
+            st = path.stat()
+            old = known.get(key)
+            if old is not None and old[1:] == (st.st_mtime_ns, st.st_size):
+                stats["unchanged"] += 1
+                continue
+            with self.conn:
+                if old is not None:
+                    self.conn.execute("DELETE FROM postings WHERE file_id = ?", (old[0],))
+                    self.conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (st.st_mtime_ns, st.st_size, old[0])
+                    )
+                    file_id = old[0]
+                else:
+                    cur = self.conn.execute(
+                        "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)", (key, st.st_mtime_ns, st.st_size)
+                    )
+                    file_id = cur.lastrowid
+                stats["postings"] += self._index_file(file_id, path)
+            stats["indexed"] += 1
+        root_dir = root.resolve()
+        for key, (file_id, _, _) in known.items():
+            # whole path segments only: re-indexing data/ must not touch data2/
+            if key not in seen and Path(key).is_relative_to(root_dir):
+                with self.conn:
+                    self.conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                    self.conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                stats["removed"] += 1
+        return stats
+
+    @staticmethod
+    def _term_select(term: str) -> Tuple[str, List[str]]:
+        base = "SELECT file_id, row, offset FROM postings WHERE "
+        if term.endswith("*"):
+            # several terms on one row can share the prefix
+            base = base.replace("SELECT", "SELECT DISTINCT", 1)
+            prefix = term[:-1]
+            if not prefix:
+                raise ValueError("prefix query needs at least one character")
+            upper = prefix_upper_bound(prefix)
+            if upper is None:
+                return base + "term >= ?", [prefix]
+            return base + "term >= ? AND term < ?", [prefix, upper]
+        return base + "term = ?", [term]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Hit]:
+        """Run a query such as 'north pen', 'north AND pen*' or 'east OR west'.
+
+        Bare terms are ANDed, AND binds tighter than OR, and a trailing *
+        makes a prefix term.
+        """
+        groups: List[List[str]] = [[]]
+        for word in query.split():
+            if word == "OR":
+                groups.append([])
+            elif word != "AND":
+                terms = tokenize(word.rstrip("*"))
+                if word.endswith("*") and terms:
+                    terms[-1] += "*"
+                groups[-1].extend(terms)
+        groups = [g for g in groups if g]
+        if not groups:
+            return []
+        parts: List[str] = []
+        params: List[str] = []
+        for group in groups:
+            selects = []
+            for term in group:
+                sql, args = self._term_select(term)
+                selects.append(sql)
+                params.extend(args)
+            parts.append(" INTERSECT ".join(selects))
+        sql = (
+            "SELECT f.path, m.row, m.offset FROM ("
+            + " UNION ".join(f"SELECT * FROM ({p})" for p in parts)
+            + ") AS m JOIN files AS f ON f.id = m.file_id ORDER BY m.file_id, m.row"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [Hit(*row) for row in self.conn.execute(sql, params)]
+
+    def count(self, term: str) -> int:
+        """Number of rows containing term (prefix terms allowed)."""
+        sql, args = self._term_select(term.lower())
+        return self.conn.execute(f"SELECT COUNT(*) FROM ({sql})", args).fetchone()[0]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=str(INDEX_PATH), help="index database path")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("build", help="index new/changed files")
+    build.add_argument("root", nargs="?", default=str(ASSETS))
+    search = sub.add_parser("search", help="query the index")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with TextIndex(args.db) as index:
+        start = time.perf_counter()
+        if args.cmd == "build":
+            print(index.update(args.root))
+        else:
+            for hit in index.search(args.query, limit=args.limit):
+                print(f"{hit.path}:{hit.row}:{hit.offset}")
+        print(f"({(time.perf_counter() - start) * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()